@@ -0,0 +1,219 @@
+"""
+Process-wide cache of finished analyses, bounded by memory.
+
+Every dashboard session (and every request of the HTTP API) reads the same
+entries, so memory grows with the number of distinct accounts analyzed
+rather than with the number of sessions. Entries are evicted least
+recently used first once their total size exceeds a byte budget, and
+expire after a TTL. Entry sizes are measured when stored (DataFrames
+deeply, Arrow tables and NumPy arrays by their buffers) and reported per
+entry, so operators can size containers from real numbers. Values that
+keep growing once stored (like RepoTableView's order cache) report their
+maximum size through an nbytes property.
+"""
+
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, fields, is_dataclass
+from types import MappingProxyType
+from typing import Hashable, Mapping, Optional
+
+from cachetools import TTLCache
+
+import tracing
+
+
+# Memory budget of the shared analysis cache (GITHUB_ANALYZER_CACHE_MB)
+ANALYSIS_CACHE_BYTES = int(os.environ.get("GITHUB_ANALYZER_CACHE_MB", "256")) * 1024 * 1024
+
+# Seconds an analysis is reused before GitHub is queried again
+ANALYSIS_TTL = 600
+
+_cache = None
+_cache_lock = threading.Lock()
+
+_missing = object()
+
+
+def sizeof(value, _seen: Optional[set] = None) -> int:
+    """
+    Estimate the memory held by a value in bytes, following containers,
+    dataclasses and object attributes. Objects reachable several times
+    are counted once.
+
+    pandas objects are measured with memory_usage(deep=True), NumPy and
+    Arrow data by their buffers (nbytes); neither library is imported.
+    """
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    if hasattr(value, "memory_usage"):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if isinstance(value, (str, bytes, bytearray)):
+        return sys.getsizeof(value)
+    if isinstance(value, Mapping):
+        return sys.getsizeof(value) + sum(
+            sizeof(k, seen) + sizeof(v, seen) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(sizeof(item, seen) for item in value)
+    if is_dataclass(value):
+        return sys.getsizeof(value) + sum(
+            sizeof(getattr(value, field.name), seen) for field in fields(value)
+        )
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + sizeof(vars(value), seen)
+    return sys.getsizeof(value)
+
+
+def freeze(value):
+    """
+    Return a read-only view of a dict (other values are returned as is).
+
+    Cached entries are shared by every session; their DataFrames must be
+    treated as read-only too (copy before modifying).
+    """
+    if isinstance(value, dict):
+        return MappingProxyType(value)
+    return value
+
+
+@dataclass
+class _Entry:
+    value: object
+    size: int
+    stored_at: float
+    hits: int = 0
+
+
+class AnalysisCache:
+    """
+    Thread-safe TTL + LRU cache bounded by the total size of its values.
+
+    Values are frozen (see freeze) and sized once when stored. A value
+    larger than the whole budget is returned but not kept. Also supports
+    cache[key] / cache[key] = value, raising KeyError on a miss.
+    """
+
+    def __init__(self, name: str, max_bytes: int = ANALYSIS_CACHE_BYTES, ttl: float = ANALYSIS_TTL):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self._entries = TTLCache(maxsize=max_bytes, ttl=ttl, getsizeof=lambda entry: entry.size)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __getitem__(self, key: Hashable):
+        value = self.get(key, _missing)
+        if value is _missing:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value) -> None:
+        self.put(key, value)
+
+    def get(self, key: Hashable, default=None):
+        """
+        Return the value stored under `key`, or `default`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            entry.hits += 1
+            self._hits += 1
+            return entry.value
+
+    def put(self, key: Hashable, value):
+        """
+        Store a value, evicting the least recently used entries as needed,
+        and return its frozen version (the one other sessions will see).
+        """
+        value = freeze(value)
+        entry = _Entry(value=value, size=sizeof(value), stored_at=time.time())
+
+        with self._lock:
+            before = len(self._entries)
+            added = key not in self._entries
+            try:
+                self._entries[key] = entry
+            except ValueError:
+                # Larger than the whole budget: serve it, but do not keep it
+                # (nor the previous, now outdated value)
+                self._entries.pop(key, None)
+                added = False
+            self._evictions += before + added - len(self._entries)
+            total, count = self._entries.currsize, len(self._entries)
+
+        tracing.set_gauge("cache_bytes", total, cache=self.name)
+        tracing.set_gauge("cache_entries", count, cache=self.name)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def entries(self) -> list[dict]:
+        """
+        Return one dict per live entry: key, size in bytes, age in seconds
+        and hits, largest first.
+        """
+        now = time.time()
+        with self._lock:
+            self._evictions += len(self._entries.expire())
+            rows = [
+                {
+                    "key": key,
+                    "bytes": entry.size,
+                    "age_s": now - entry.stored_at,
+                    "hits": entry.hits,
+                }
+                for key, entry in self._entries.items()
+            ]
+        return sorted(rows, key=lambda row: row["bytes"], reverse=True)
+
+    def stats(self) -> dict:
+        """
+        Return the totals: entries, bytes used and budget, hits, misses and
+        entries evicted (for space or expiry).
+        """
+        with self._lock:
+            self._evictions += len(self._entries.expire())
+            return {
+                "cache": self.name,
+                "entries": len(self._entries),
+                "bytes": self._entries.currsize,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """
+    Return the process-wide analysis cache.
+    """
+    global _cache
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AnalysisCache("analysis")
+
+    return _cache
@@ -1,9 +1,370 @@
+import itertools
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Iterator, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+import tracing
+from http_cache import HttpCache
+from rate_limit import RateLimitScheduler
+from transport import RecordingAdapter, ReplayAdapter
 
 
 BASE_URL = "https://api.github.com"
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+HEADERS = {
+    "Accept": "application/vnd.github+json",
+    "User-Agent": "github-profile-analyzer"
+}
+
+# 100 is the max page size allowed by the GitHub REST API
+PER_PAGE = 100
+
+# Upper bound on concurrent page requests, and on HTTP requests in flight
+# across the whole process (the size of the connection pool)
+MAX_WORKERS = 8
+
+# On-disk conditional-request cache (set CACHE_PATH to None to disable)
+CACHE_PATH = ".github_api_cache.sqlite"
+CACHE_TTL = 300
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Comma-separated personal access tokens; requests are spread across them
+TOKENS = [t.strip() for t in os.environ.get("GITHUB_TOKENS", "").split(",") if t.strip()]
+
+# Pacing shared by all tokens (requests per second and burst size)
+REQUESTS_PER_SECOND = 10
+REQUEST_BURST = 20
+
+# Retries for 5xx and rate-limited responses (jittered exponential backoff)
+MAX_RETRIES = 5
+RETRY_BACKOFF = 0.5
+RETRY_MAX_WAIT = 30
+
+REQUEST_TIMEOUT = 30
+
+# GraphQL bulk fetching: users per query, and the maximum number of
+# repository nodes a single query may request (its cost budget)
+GRAPHQL_USERS_PER_QUERY = 20
+GRAPHQL_NODE_BUDGET = 2000
+
+# Offline runs: record every exchange to, or replay them from, an archive
+# (gzip JSON lines). Replay simulates the given latency (seconds) and, if
+# set, a rate limit budget per hour.
+RECORD_PATH = os.environ.get("GITHUB_API_RECORD") or None
+REPLAY_PATH = os.environ.get("GITHUB_API_REPLAY") or None
+REPLAY_LATENCY = float(os.environ.get("GITHUB_API_REPLAY_LATENCY", "0"))
+REPLAY_RATE_LIMIT = int(os.environ.get("GITHUB_API_REPLAY_RATE_LIMIT", "0")) or None
+
+_session = None
+_session_lock = threading.Lock()
+
+# Callers nest thread pools (batch workers x page fetchers), so requests
+# take a slot here first and never outnumber the pooled connections.
+_request_slots = threading.BoundedSemaphore(MAX_WORKERS)
+
+_cache = None
+_cache_lock = threading.Lock()
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Return the shared requests.Session used for all API calls.
+
+    The session keeps connections to api.github.com alive between calls,
+    so the profile request and every repo page reuse the same pool. In
+    record / replay mode (see configure_transport) its transport is
+    swapped for the archive-backed one.
+    """
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers.update(HEADERS)
+                if REPLAY_PATH:
+                    adapter = ReplayAdapter(
+                        REPLAY_PATH, latency=REPLAY_LATENCY, rate_limit=REPLAY_RATE_LIMIT
+                    )
+                elif RECORD_PATH:
+                    adapter = RecordingAdapter(
+                        RECORD_PATH, pool_connections=1, pool_maxsize=MAX_WORKERS
+                    )
+                else:
+                    adapter = HTTPAdapter(
+                        pool_connections=1,
+                        pool_maxsize=MAX_WORKERS,
+                    )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+
+    return _session
+
+
+def configure_transport(
+    record: Optional[str] = None,
+    replay: Optional[str] = None,
+    latency: float = 0.0,
+    rate_limit: Optional[int] = None,
+) -> None:
+    """
+    Switch the shared session to recording every exchange to the archive
+    `record`, to replaying them from the archive `replay` (no network
+    access at all), or back to the network when both are None.
+
+    For a replay to match a recording request for request, run it with
+    the same HTTP cache state (or with the cache disabled in both).
+    """
+    global _session, RECORD_PATH, REPLAY_PATH, REPLAY_LATENCY, REPLAY_RATE_LIMIT
+
+    if record and replay:
+        raise ValueError("Cannot record and replay at the same time.")
+
+    with _session_lock:
+        RECORD_PATH, REPLAY_PATH = record, replay
+        REPLAY_LATENCY, REPLAY_RATE_LIMIT = latency, rate_limit
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def get_cache() -> Optional[HttpCache]:
+    """
+    Return the shared HTTP response cache, or None if caching is disabled.
+    """
+    global _cache
+
+    if _cache is None and CACHE_PATH:
+        with _cache_lock:
+            if _cache is None:
+                _cache = HttpCache(
+                    CACHE_PATH, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES
+                )
+
+    return _cache
+
+
+def configure_cache(
+    path: Optional[str] = CACHE_PATH,
+    ttl: float = CACHE_TTL,
+    max_bytes: int = CACHE_MAX_BYTES,
+) -> None:
+    """
+    Replace the shared HTTP response cache. Pass path=None to disable it.
+    """
+    global _cache, CACHE_PATH, CACHE_TTL, CACHE_MAX_BYTES
+
+    with _cache_lock:
+        CACHE_PATH, CACHE_TTL, CACHE_MAX_BYTES = path, ttl, max_bytes
+        _cache = None
+
+
+def get_scheduler() -> RateLimitScheduler:
+    """
+    Return the shared rate limit scheduler.
+    """
+    global _scheduler
+
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = RateLimitScheduler(
+                    TOKENS, rate=REQUESTS_PER_SECOND, burst=REQUEST_BURST
+                )
+
+    return _scheduler
+
+
+def configure_tokens(tokens: list[str]) -> None:
+    """
+    Replace the pool of API tokens used by the scheduler.
+    """
+    global _scheduler, TOKENS
+
+    with _scheduler_lock:
+        TOKENS = list(tokens)
+        _scheduler = None
+
+
+def get_rate_limit_status() -> list[dict]:
+    """
+    Return the remaining rate limit budget of every configured token.
+    """
+    return get_scheduler().remaining()
+
+
+class _RetryableResponse(Exception):
+    """
+    Raised inside _send for responses worth retrying (5xx, rate limits).
+    """
+
+    def __init__(self, response: requests.Response):
+        super().__init__(response.status_code)
+        self.response = response
+
+
+def _is_retryable(response: requests.Response) -> bool:
+    if response.status_code >= 500:
+        return True
+    if response.status_code in (403, 429):
+        # Secondary limits come with Retry-After; primary ones with an
+        # exhausted budget. Both can be retried (possibly on another token).
+        return (
+            "Retry-After" in response.headers
+            or response.headers.get("X-RateLimit-Remaining") == "0"
+        )
+    return False
+
+
+def _last_response(retry_state) -> requests.Response:
+    """
+    Once retries are exhausted, hand the last response back to the caller
+    so it can raise its usual error.
+    """
+    exc = retry_state.outcome.exception()
+    if isinstance(exc, _RetryableResponse):
+        return exc.response
+    raise exc
+
 
+def _count_retry(retry_state) -> None:
+    tracing.count("http_retries_total")
 
+
+@retry(
+    retry=retry_if_exception_type(
+        (_RetryableResponse, requests.ConnectionError, requests.Timeout)
+    ),
+    wait=wait_random_exponential(multiplier=RETRY_BACKOFF, max=RETRY_MAX_WAIT),
+    stop=stop_after_attempt(MAX_RETRIES),
+    before_sleep=_count_retry,
+    retry_error_callback=_last_response,
+)
+def _send(
+    url: str,
+    params: Optional[dict],
+    headers: dict,
+    json_body: Optional[dict] = None,
+) -> requests.Response:
+    """
+    Send a single request through the rate limit scheduler.
+    A GET, or a POST when json_body is given (GraphQL).
+    """
+    scheduler = get_scheduler()
+    state = scheduler.acquire()
+
+    if state.token:
+        headers = {**headers, "Authorization": f"Bearer {state.token}"}
+
+    method = "GET" if json_body is None else "POST"
+    with _request_slots, tracing.stage("api.http_request"):
+        response = get_session().request(
+            method,
+            url,
+            params=params,
+            headers=headers,
+            json=json_body,
+            timeout=REQUEST_TIMEOUT,
+        )
+    scheduler.update(state, response.headers)
+
+    if tracing.is_enabled():
+        tracing.count("http_requests_total", method=method, status=response.status_code)
+        tracing.count("http_response_bytes_total", len(response.content))
+        tracing.set_gauge("rate_limit_remaining", state.remaining, token=state.label)
+
+    if _is_retryable(response):
+        raise _RetryableResponse(response)
+
+    return response
+
+
+def _cached_response(url: str, entry: dict) -> requests.Response:
+    """
+    Rebuild a requests.Response from a cache entry.
+    """
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response._content = entry["body"]
+    response.encoding = "utf-8"
+    return response
+
+
+def _get(url: str, params: Optional[dict] = None) -> requests.Response:
+    """
+    GET a URL on the shared session, going through the response cache.
+
+    Fresh cache entries are returned without any network call. Stale
+    entries are revalidated with `If-None-Match` / `If-Modified-Since`;
+    a 304 answer is served from disk and does not count against the
+    rate limit.
+    """
+    cache = get_cache()
+    if cache is None:
+        return _send(url, params, {})
+
+    key = f"{url}?{urlencode(sorted((params or {}).items()))}"
+    entry = cache.get(key)
+    tracing.count("cache_lookups_total", cache="http")
+
+    if entry is not None and entry["fresh"]:
+        return _cached_response(url, entry)
+
+    headers = {}
+    if entry is not None:
+        if "ETag" in entry["headers"]:
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if "Last-Modified" in entry["headers"]:
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+
+    response = _send(url, params, headers)
+
+    if response.status_code == 304 and entry is not None:
+        cache.touch(key)
+        tracing.count("http_revalidated_total")
+        return _cached_response(url, entry)
+
+    tracing.count("cache_misses_total", cache="http")
+    if response.status_code == 200:
+        cache.put(key, response.content, response.headers)
+
+    return response
+
+
+def _get_last_page(response: requests.Response) -> int:
+    """
+    Read the last page number from the `Link` header of a paginated response.
+    Returns 1 when the response has no further pages.
+    """
+    last_url = response.links.get("last", {}).get("url")
+    if not last_url:
+        return 1
+
+    page = parse_qs(urlparse(last_url).query).get("page", ["1"])[0]
+    return int(page)
+
+
+@tracing.traced("api.get_user_profile")
 def get_user_profile(username: str) -> dict:
     """
     Fetch basic user profile data from the GitHub REST API.
@@ -13,12 +374,8 @@ def get_user_profile(username: str) -> dict:
         RuntimeError: For other non-success HTTP responses.
     """
     url = f"{BASE_URL}/users/{username}"
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "User-Agent": "github-profile-analyzer"
-    }
 
-    response = requests.get(url, headers=headers)
+    response = _get(url)
 
     if response.status_code == 404:
         raise ValueError(f"GitHub user '{username}' not found.")
@@ -31,27 +388,22 @@ def get_user_profile(username: str) -> dict:
     return response.json()
 
 
-def get_user_repos(username: str) -> list[dict]:
+def _get_repos_page(username: str, page: int) -> requests.Response:
     """
-    Fetch public repositories for a given GitHub user.
+    Fetch a single page of public repositories for a given GitHub user.
 
     Raises:
         ValueError: If the user is not found (404).
         RuntimeError: For other non-success HTTP responses.
     """
     url = f"{BASE_URL}/users/{username}/repos"
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "User-Agent": "github-profile-analyzer"
-    }
-
-    # You can adjust per_page if needed; 100 is the max
     params = {
-        "per_page": 100,
-        "sort": "updated"
+        "per_page": PER_PAGE,
+        "sort": "updated",
+        "page": page,
     }
 
-    response = requests.get(url, headers=headers, params=params)
+    response = _get(url, params=params)
 
     if response.status_code == 404:
         raise ValueError(f"GitHub user '{username}' not found when fetching repos.")
@@ -61,9 +413,451 @@ def get_user_repos(username: str) -> list[dict]:
             f"status {response.status_code} - {response.text}"
         )
 
+    return response
+
+
+@tracing.traced("api.get_user_repos")
+def get_user_repos(username: str) -> list[dict]:
+    """
+    Fetch all public repositories for a given GitHub user.
+
+    The first page tells us (through the `Link` header) how many pages
+    there are; the remaining pages are then fetched concurrently on the
+    shared session and concatenated in page order.
+
+    Raises:
+        ValueError: If the user is not found (404).
+        RuntimeError: For other non-success HTTP responses.
+    """
+    first_page = _get_repos_page(username, 1)
+    repos = first_page.json()
+
+    last_page = _get_last_page(first_page)
+    if last_page <= 1:
+        return repos
+
+    pages = range(2, last_page + 1)
+    workers = min(MAX_WORKERS, len(pages))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for response in executor.map(
+            lambda page: _get_repos_page(username, page), pages
+        ):
+            repos.extend(response.json())
+
+    return repos
+
+
+def iter_user_repo_pages(username: str) -> Iterator[list[dict]]:
+    """
+    Stream the public repositories of a user page by page, as each page
+    arrives (in completion order, not page order).
+
+    Raises:
+        ValueError: If the user is not found (404).
+        RuntimeError: For other non-success HTTP responses.
+    """
+    return _iter_pages(lambda page: _get_repos_page(username, page))
+
+
+@tracing.traced("api.get_user_repos_updated_since")
+def get_user_repos_updated_since(username: str, since: str) -> list[dict]:
+    """
+    Fetch the public repositories of a user updated at or after `since`
+    (an ISO-8601 timestamp such as "2024-05-01T12:00:00Z").
+
+    Pages are requested one by one in `sort=updated` order, and pagination
+    stops at the first repository older than `since`, so a refresh of a
+    mostly unchanged account costs a single page.
+
+    Raises:
+        ValueError: If the user is not found (404).
+        RuntimeError: For other non-success HTTP responses.
+    """
+    repos = []
+    page = 1
+
+    while True:
+        response = _get_repos_page(username, page)
+        for repo in response.json():
+            if (repo.get("updated_at") or "") < since:
+                return repos
+            repos.append(repo)
+
+        if page >= _get_last_page(response):
+            return repos
+        page += 1
+
+
+@tracing.traced("api.get_org_profile")
+def get_org_profile(org: str) -> dict:
+    """
+    Fetch basic organization profile data from the GitHub REST API.
+
+    Raises:
+        ValueError: If the organization is not found (404).
+        RuntimeError: For other non-success HTTP responses.
+    """
+    url = f"{BASE_URL}/orgs/{org}"
+
+    response = _get(url)
+
+    if response.status_code == 404:
+        raise ValueError(f"GitHub organization '{org}' not found.")
+    if response.status_code != 200:
+        raise RuntimeError(
+            f"GitHub API error for organization '{org}': "
+            f"status {response.status_code} - {response.text}"
+        )
+
     return response.json()
 
 
+def _get_org_repos_page(org: str, page: int) -> requests.Response:
+    """
+    Fetch a single page of public repositories for a GitHub organization.
+
+    Raises:
+        ValueError: If the organization is not found (404).
+        RuntimeError: For other non-success HTTP responses.
+    """
+    url = f"{BASE_URL}/orgs/{org}/repos"
+    params = {
+        "type": "public",
+        "per_page": PER_PAGE,
+        "sort": "updated",
+        "page": page,
+    }
+
+    response = _get(url, params=params)
+
+    if response.status_code == 404:
+        raise ValueError(f"GitHub organization '{org}' not found when fetching repos.")
+    if response.status_code != 200:
+        raise RuntimeError(
+            f"GitHub API error for repos of organization '{org}': "
+            f"status {response.status_code} - {response.text}"
+        )
+
+    return response
+
+
+def _iter_pages(
+    get_page: Callable[[int], requests.Response]
+) -> Iterator[list[dict]]:
+    """
+    Yield the pages of a paginated listing as soon as each one arrives.
+
+    Pages after the first are fetched concurrently, with at most
+    MAX_WORKERS requests in flight, and are yielded in completion order,
+    so callers should not rely on page order.
+    """
+    first_page = get_page(1)
+    last_page = _get_last_page(first_page)
+    yield first_page.json()
+
+    pages = iter(range(2, last_page + 1))
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        in_flight = {
+            executor.submit(get_page, page)
+            for page in itertools.islice(pages, MAX_WORKERS)
+        }
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result().json()
+                page = next(pages, None)
+                if page is not None:
+                    in_flight.add(executor.submit(get_page, page))
+
+
+def iter_org_repo_pages(org: str) -> Iterator[list[dict]]:
+    """
+    Stream the public repositories of an organization page by page,
+    without ever holding the whole listing in memory.
+
+    Raises:
+        ValueError: If the organization is not found (404).
+        RuntimeError: For other non-success HTTP responses.
+    """
+    return _iter_pages(lambda page: _get_org_repos_page(org, page))
+
+
+def get_repo_languages(full_name: str) -> dict:
+    """
+    Fetch the language breakdown (bytes of code per language) of a
+    repository, e.g. {"C": 40213, "Python": 9120}.
+
+    Raises:
+        ValueError: If the repository is not found (404).
+        RuntimeError: For other non-success HTTP responses.
+    """
+    url = f"{BASE_URL}/repos/{full_name}/languages"
+
+    response = _get(url)
+
+    if response.status_code == 404:
+        raise ValueError(f"GitHub repository '{full_name}' not found.")
+    if response.status_code != 200:
+        raise RuntimeError(
+            f"GitHub API error for languages of '{full_name}': "
+            f"status {response.status_code} - {response.text}"
+        )
+
+    return response.json()
+
+
+def _get_repo_languages_cached(full_name: str, pushed_at: Optional[str]) -> dict:
+    """
+    Return a repository's language breakdown, cached by (repo, pushed_at).
+
+    The breakdown only changes when something is pushed, so an entry for
+    the same pushed_at is reused forever (until evicted) and unchanged
+    repositories are never queried again. Repositories that disappeared
+    in the meantime get an empty breakdown.
+    """
+    cache = get_cache()
+    key = f"languages:{full_name}@{pushed_at}"
+
+    if cache is not None and pushed_at:
+        entry = cache.get(key)
+        tracing.count("cache_lookups_total", cache="languages")
+        if entry is not None:
+            return json.loads(entry["body"])
+        tracing.count("cache_misses_total", cache="languages")
+
+    try:
+        languages = get_repo_languages(full_name)
+    except ValueError:
+        languages = {}
+
+    if cache is not None and pushed_at:
+        cache.put(key, json.dumps(languages).encode(), {})
+
+    return languages
+
+
+@tracing.traced("api.get_repos_languages")
+def get_repos_languages(repos: list[tuple[str, Optional[str]]]) -> dict[str, dict]:
+    """
+    Fetch the language breakdown of many repositories concurrently.
+
+    `repos` holds (full_name, pushed_at) pairs. Requests fan out over at
+    most MAX_WORKERS threads sharing the pooled session. Returns a dict
+    mapping full_name to its {language: bytes} breakdown.
+
+    Raises:
+        RuntimeError: For non-success HTTP responses other than 404.
+    """
+    if not repos:
+        return {}
+
+    workers = min(MAX_WORKERS, len(repos))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        breakdowns = executor.map(
+            lambda repo: _get_repo_languages_cached(*repo), repos
+        )
+        return {full_name: languages for (full_name, _), languages in zip(repos, breakdowns)}
+
+
+_GRAPHQL_PROFILE_FIELDS = (
+    "login name bio location avatarUrl url createdAt "
+    "followers { totalCount } following { totalCount }"
+)
+
+_GRAPHQL_REPO_FIELDS = (
+    "name nameWithOwner description url "
+    "stargazerCount forkCount createdAt pushedAt updatedAt "
+    "primaryLanguage { name }"
+)
+
+
+def _graphql_query(batch: list[tuple[str, Optional[str], bool]]) -> tuple[str, dict]:
+    """
+    Build one query with an aliased `user` sub-query per login.
+
+    `batch` holds (login, repositories cursor, include profile fields).
+    Logins and cursors are passed as variables, never inlined.
+    """
+    declarations = []
+    selections = []
+    variables = {}
+
+    for i, (login, cursor, with_profile) in enumerate(batch):
+        declarations.append(f"$login{i}: String!, $cursor{i}: String")
+        variables[f"login{i}"] = login
+        variables[f"cursor{i}"] = cursor
+        selections.append(
+            f"""
+            u{i}: user(login: $login{i}) {{
+                {_GRAPHQL_PROFILE_FIELDS if with_profile else ""}
+                repositories(
+                    first: {PER_PAGE}, after: $cursor{i},
+                    privacy: PUBLIC, ownerAffiliations: OWNER,
+                    orderBy: {{field: UPDATED_AT, direction: DESC}}
+                ) {{
+                    totalCount
+                    pageInfo {{ hasNextPage endCursor }}
+                    nodes {{ {_GRAPHQL_REPO_FIELDS} }}
+                }}
+            }}"""
+        )
+
+    query = f"query({', '.join(declarations)}) {{{''.join(selections)}\n}}"
+    return query, variables
+
+
+def _graphql_profile(node: dict) -> dict:
+    """
+    Convert a GraphQL user node to the REST /users/{username} shape.
+    """
+    return {
+        "login": node.get("login"),
+        "name": node.get("name"),
+        "bio": node.get("bio"),
+        "location": node.get("location"),
+        "avatar_url": node.get("avatarUrl"),
+        "html_url": node.get("url"),
+        "created_at": node.get("createdAt"),
+        "followers": (node.get("followers") or {}).get("totalCount", 0),
+        "following": (node.get("following") or {}).get("totalCount", 0),
+        "public_repos": node["repositories"]["totalCount"],
+    }
+
+
+def _graphql_repo(node: dict) -> dict:
+    """
+    Convert a GraphQL repository node to the REST /users/{username}/repos shape.
+    """
+    return {
+        "name": node.get("name"),
+        "full_name": node.get("nameWithOwner"),
+        "description": node.get("description"),
+        "language": (node.get("primaryLanguage") or {}).get("name"),
+        "stargazers_count": node.get("stargazerCount", 0),
+        "forks_count": node.get("forkCount", 0),
+        "created_at": node.get("createdAt"),
+        "pushed_at": node.get("pushedAt"),
+        "updated_at": node.get("updatedAt"),
+        "html_url": node.get("url"),
+    }
+
+
+def _post_graphql(query: str, variables: dict) -> dict:
+    """
+    Send a GraphQL query and return its `data`.
+
+    Raises:
+        RuntimeError: For non-success HTTP responses or query errors
+            other than missing users.
+    """
+    response = _send(GRAPHQL_URL, None, {}, json_body={"query": query, "variables": variables})
+
+    if response.status_code != 200:
+        raise RuntimeError(
+            f"GitHub GraphQL API error: status {response.status_code} - {response.text}"
+        )
+
+    payload = response.json()
+    errors = [e for e in payload.get("errors") or [] if e.get("type") != "NOT_FOUND"]
+    if errors:
+        raise RuntimeError(f"GitHub GraphQL API error: {errors[0].get('message')}")
+
+    return payload.get("data") or {}
+
+
+@tracing.traced("api.get_users_bulk")
+def get_users_bulk(usernames: list[str]) -> dict[str, tuple[dict, list[dict]]]:
+    """
+    Fetch profiles and all public repositories of many users through the
+    GitHub GraphQL API, several users per query (aliased sub-queries).
+
+    Each query asks for at most GRAPHQL_USERS_PER_QUERY users and at most
+    GRAPHQL_NODE_BUDGET repository nodes; users with more repositories are
+    paginated with their cursor in later queries. Requires a token
+    (GITHUB_TOKENS), as the GraphQL API does not allow anonymous access.
+
+    Returns a dict mapping each username to (profile, repos), in the same
+    shapes as get_user_profile / get_user_repos. Users that do not exist
+    are left out of the result.
+
+    Raises:
+        RuntimeError: For non-success HTTP responses or query errors.
+    """
+    per_query = max(1, min(GRAPHQL_USERS_PER_QUERY, GRAPHQL_NODE_BUDGET // PER_PAGE))
+
+    results: dict[str, tuple[dict, list[dict]]] = {}
+    # login -> (cursor, profile fields still needed)
+    pending = {login: (None, True) for login in dict.fromkeys(usernames)}
+
+    while pending:
+        batch = [
+            (login, cursor, with_profile)
+            for login, (cursor, with_profile) in list(pending.items())[:per_query]
+        ]
+        query, variables = _graphql_query(batch)
+        data = _post_graphql(query, variables)
+
+        for i, (login, _, with_profile) in enumerate(batch):
+            node = data.get(f"u{i}")
+            if node is None:
+                pending.pop(login)
+                continue
+
+            repositories = node["repositories"]
+            if with_profile:
+                results[login] = (_graphql_profile(node), [])
+            results[login][1].extend(
+                _graphql_repo(repo) for repo in repositories["nodes"]
+            )
+
+            page_info = repositories["pageInfo"]
+            if page_info["hasNextPage"]:
+                pending[login] = (page_info["endCursor"], False)
+            else:
+                pending.pop(login)
+
+    return results
+
+
+def _get_user_or_none(username: str) -> Optional[tuple[dict, list[dict]]]:
+    try:
+        return get_user_profile(username), get_user_repos(username)
+    except ValueError:
+        return None
+
+
+@tracing.traced("api.get_users")
+def get_users(usernames: list[str]) -> dict[str, tuple[dict, list[dict]]]:
+    """
+    Fetch profiles and all public repositories of many users, e.g. for a
+    comparison.
+
+    With a token configured this is get_users_bulk (a few GraphQL
+    queries); anonymously, users are fetched over REST with up to
+    MAX_WORKERS users in flight. Same result shape as get_users_bulk:
+    username -> (profile, repos), unknown users left out.
+
+    Raises:
+        RuntimeError: For non-success HTTP responses.
+    """
+    usernames = list(dict.fromkeys(usernames))
+    if TOKENS:
+        return get_users_bulk(usernames)
+    if not usernames:
+        return {}
+
+    workers = min(MAX_WORKERS, len(usernames))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        fetched = executor.map(_get_user_or_none, usernames)
+        return {
+            username: result
+            for username, result in zip(usernames, fetched)
+            if result is not None
+        }
+
+
 if __name__ == "__main__":
     # Simple manual test when running:
     # python app/api_client.py
@@ -0,0 +1,470 @@
+"""
+Headless batch analysis of many GitHub users.
+
+Usage:
+    python app/batch.py usernames.txt --output results.csv
+    python app/batch.py usernames.txt --output results_parquet/ --format parquet
+    python app/batch.py usernames.txt --output results.csv --record api.jsonl.gz
+    python app/batch.py usernames.txt --output results.csv --replay api.jsonl.gz
+
+Each line of the input file is a username. Users are analyzed
+concurrently and every result is written out as soon as it is ready, so
+memory stays flat regardless of the size of the list. Finished usernames
+are appended to a checkpoint file; re-running the same command skips
+them, which makes a crashed or rate-limited run resumable.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import tracing
+from api_client import (
+    GRAPHQL_USERS_PER_QUERY,
+    configure_cache,
+    configure_transport,
+    get_user_profile,
+    get_user_repos,
+    get_users_bulk,
+)
+from data_processing import RepoSummary, build_repos_dataframe, summarize_repos
+from history import append_snapshot
+from snapshots import SnapshotStore, refresh_user
+
+
+RESULT_COLUMNS = [
+    "username",
+    "name",
+    "public_repos",
+    "followers",
+    "following",
+    "account_created",
+    "repo_count",
+    "total_stars",
+    "total_forks",
+    "top_language",
+    "top_repo",
+    "top_repo_stars",
+    "last_pushed_repo",
+    "last_pushed_at",
+    "languages",
+    "activity_by_year",
+    "error",
+]
+
+
+def analyze_user(
+    username: str,
+    store: Optional[SnapshotStore] = None,
+    history_dir: Optional[str] = None,
+) -> dict:
+    """
+    Run the full analysis pipeline for one user and flatten it into a row.
+
+    With a snapshot store, only repositories changed since the previous
+    run are downloaded (see snapshots.refresh_user). With history_dir,
+    the result is also appended to the historical dataset there.
+
+    Raises:
+        ValueError: If the user is not found (404).
+        RuntimeError: For other non-success HTTP responses.
+    """
+    summary = None
+    if store is not None:
+        user_profile, df_repos, summary, _ = refresh_user(username, store, n=1)
+    else:
+        user_profile = get_user_profile(username)
+        df_repos = build_repos_dataframe(get_user_repos(username))
+
+    if history_dir:
+        append_snapshot(username, user_profile, df_repos, history_dir=history_dir)
+    return summarize_user(username, user_profile, df_repos, summary)
+
+
+def analyze_users(
+    usernames: list[str],
+    use_graphql: bool = False,
+    store: Optional[SnapshotStore] = None,
+    history_dir: Optional[str] = None,
+) -> list[tuple]:
+    """
+    Analyze a chunk of users and return (username, row) pairs. On failure
+    the row is the raised exception instead.
+
+    With use_graphql=True the whole chunk is fetched with GraphQL bulk
+    queries instead of two or more REST calls per user.
+    """
+    if not use_graphql:
+        results = []
+        for username in usernames:
+            try:
+                results.append((username, analyze_user(username, store, history_dir)))
+            except Exception as e:
+                results.append((username, e))
+        return results
+
+    try:
+        fetched = get_users_bulk(usernames)
+    except Exception as e:
+        return [(username, e) for username in usernames]
+
+    results = []
+    for username in usernames:
+        if username not in fetched:
+            results.append((username, ValueError(f"GitHub user '{username}' not found.")))
+            continue
+
+        user_profile, repos_json = fetched[username]
+        try:
+            df_repos = build_repos_dataframe(repos_json)
+            if history_dir:
+                append_snapshot(username, user_profile, df_repos, history_dir=history_dir)
+            results.append((username, summarize_user(username, user_profile, df_repos)))
+        except Exception as e:
+            results.append((username, e))
+    return results
+
+
+def summarize_user(
+    username: str,
+    user_profile: dict,
+    df_repos: pd.DataFrame,
+    summary: Optional[RepoSummary] = None,
+) -> dict:
+    """
+    Flatten a user's profile and repository frame into a result row.
+    `summary` (top-N lists of one repository) is computed when not given.
+    """
+
+    if summary is None:
+        summary = summarize_repos(df_repos, n=1)
+    lang_stats_df = summary.lang_stats
+    activity_df = summary.activity
+    top_stars_df = summary.top_stars
+    top_recent_df = summary.top_recent
+
+    row = dict.fromkeys(RESULT_COLUMNS)
+    row.update(
+        {
+            "username": username,
+            "name": user_profile.get("name"),
+            "public_repos": user_profile.get("public_repos"),
+            "followers": user_profile.get("followers"),
+            "following": user_profile.get("following"),
+            "account_created": user_profile.get("created_at"),
+            "repo_count": summary.repo_count,
+            "total_stars": summary.total_stars,
+            "total_forks": summary.total_forks,
+            "languages": json.dumps(
+                dict(zip(lang_stats_df["language"], lang_stats_df["repo_count"].astype(int)))
+            ),
+            "activity_by_year": json.dumps(
+                {
+                    str(int(year)): int(count)
+                    for year, count in zip(activity_df["year"], activity_df["repo_count"])
+                    if pd.notna(year)
+                }
+            ),
+        }
+    )
+
+    if not lang_stats_df.empty:
+        row["top_language"] = lang_stats_df["language"].iloc[0]
+    if not top_stars_df.empty:
+        row["top_repo"] = top_stars_df["name"].iloc[0]
+        row["top_repo_stars"] = int(top_stars_df["stars"].iloc[0])
+    if not top_recent_df.empty:
+        row["last_pushed_repo"] = top_recent_df["name"].iloc[0]
+        pushed_at = top_recent_df["pushed_at"].iloc[0]
+        row["last_pushed_at"] = pushed_at.isoformat() if pd.notna(pushed_at) else None
+
+    return row
+
+
+class CsvResultWriter:
+    """
+    Append result rows to a CSV file, flushing after every row.
+    """
+
+    def __init__(self, path: str):
+        write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "a", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=RESULT_COLUMNS)
+        if write_header:
+            self._writer.writeheader()
+
+    def write(self, row: dict) -> list[str]:
+        """
+        Write a row and return the usernames that are now durably stored.
+        """
+        self._writer.writerow(row)
+        self._file.flush()
+        return [row["username"]]
+
+    def close(self) -> list[str]:
+        self._file.close()
+        return []
+
+
+class ParquetResultWriter:
+    """
+    Write result rows as a directory of Parquet part files.
+
+    Parquet files cannot be appended to, so rows are buffered and flushed
+    as a new part file every `batch_size` rows (and on close).
+    """
+
+    def __init__(self, path: str, batch_size: int = 500):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self._rows: list[dict] = []
+        self._part = len([f for f in os.listdir(path) if f.endswith(".parquet")])
+
+    def write(self, row: dict) -> list[str]:
+        self._rows.append(row)
+        if len(self._rows) >= self.batch_size:
+            return self._flush()
+        return []
+
+    def close(self) -> list[str]:
+        return self._flush()
+
+    def _flush(self) -> list[str]:
+        if not self._rows:
+            return []
+
+        table = pa.Table.from_pylist(self._rows, schema=_parquet_schema())
+        part_path = os.path.join(self.path, f"part-{self._part:05d}.parquet")
+        pq.write_table(table, part_path)
+        self._part += 1
+
+        written = [row["username"] for row in self._rows]
+        self._rows = []
+        return written
+
+
+def _parquet_schema() -> pa.Schema:
+    int_columns = {
+        "public_repos",
+        "followers",
+        "following",
+        "repo_count",
+        "total_stars",
+        "total_forks",
+        "top_repo_stars",
+    }
+    return pa.schema(
+        [
+            (name, pa.int64() if name in int_columns else pa.string())
+            for name in RESULT_COLUMNS
+        ]
+    )
+
+
+def read_usernames(path: str) -> Iterator[str]:
+    """
+    Yield non-empty, non-comment usernames from a text file, one per line.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            username = line.strip()
+            if username and not username.startswith("#"):
+                yield username
+
+
+def load_checkpoint(path: str) -> set[str]:
+    """
+    Return the usernames already recorded in the checkpoint file.
+    """
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def run_batch(
+    input_path: str,
+    output_path: str,
+    output_format: str = "csv",
+    checkpoint_path: Optional[str] = None,
+    workers: int = 4,
+    max_in_flight: Optional[int] = None,
+    use_graphql: bool = False,
+    snapshot_dir: Optional[str] = None,
+    history_dir: Optional[str] = None,
+) -> dict:
+    """
+    Analyze every username in `input_path` and stream results to
+    `output_path`. Returns a dict with ok / not_found / failed counts.
+
+    Work is submitted in chunks of users: one user per chunk over REST,
+    GRAPHQL_USERS_PER_QUERY users per chunk with use_graphql=True.
+    With snapshot_dir, REST refreshes are incremental against the
+    snapshots stored there. With history_dir, every analysis is also
+    appended to the historical Parquet dataset there.
+    """
+    checkpoint_path = checkpoint_path or f"{output_path.rstrip(os.sep)}.checkpoint"
+    max_in_flight = max_in_flight or workers * 2
+    done = load_checkpoint(checkpoint_path)
+    store = SnapshotStore(snapshot_dir) if snapshot_dir else None
+
+    if output_format == "parquet":
+        writer = ParquetResultWriter(output_path)
+    else:
+        writer = CsvResultWriter(output_path)
+
+    counts = {"ok": 0, "not_found": 0, "failed": 0, "skipped": 0}
+
+    with open(checkpoint_path, "a", encoding="utf-8") as checkpoint, ThreadPoolExecutor(
+        max_workers=workers
+    ) as executor:
+
+        def record(usernames: list[str]) -> None:
+            for name in usernames:
+                checkpoint.write(name + "\n")
+            checkpoint.flush()
+            os.fsync(checkpoint.fileno())
+
+        def handle(future) -> None:
+            for username, row in future.result():
+                if isinstance(row, ValueError):
+                    # Missing users will not appear on a retry; record them.
+                    error = str(row)
+                    row = dict.fromkeys(RESULT_COLUMNS)
+                    row.update({"username": username, "error": error})
+                    counts["not_found"] += 1
+                elif isinstance(row, Exception):
+                    # Left out of the checkpoint so a re-run retries them.
+                    print(f"[batch] {username}: {row}", file=sys.stderr)
+                    counts["failed"] += 1
+                    continue
+                else:
+                    counts["ok"] += 1
+                record(writer.write(row))
+
+        def submit(chunk: list[str]) -> None:
+            if len(in_flight) >= max_in_flight:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    in_flight.remove(future)
+                    handle(future)
+            in_flight.add(executor.submit(analyze_users, chunk, use_graphql, store, history_dir))
+
+        chunk_size = GRAPHQL_USERS_PER_QUERY if use_graphql else 1
+        in_flight = set()
+        chunk = []
+        for username in read_usernames(input_path):
+            if username in done:
+                counts["skipped"] += 1
+                continue
+            done.add(username)
+
+            chunk.append(username)
+            if len(chunk) >= chunk_size:
+                submit(chunk)
+                chunk = []
+
+        if chunk:
+            submit(chunk)
+
+        for future in list(in_flight):
+            handle(future)
+
+        record(writer.close())
+
+    return counts
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Analyze many GitHub profiles without the dashboard."
+    )
+    parser.add_argument("input", help="Text file with one GitHub username per line")
+    parser.add_argument("-o", "--output", required=True, help="CSV file or Parquet directory")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--workers", type=int, default=4, help="Users analyzed concurrently")
+    parser.add_argument(
+        "--max-in-flight", type=int, help="Maximum queued chunks (default: 2 x workers)"
+    )
+    parser.add_argument(
+        "--graphql",
+        action="store_true",
+        help="Fetch users in bulk through the GraphQL API (requires GITHUB_TOKENS)",
+    )
+    parser.add_argument(
+        "--snapshots",
+        metavar="DIR",
+        help="Keep per-user snapshots in DIR and only fetch repos changed since the last run",
+    )
+    parser.add_argument(
+        "--history",
+        metavar="DIR",
+        help="Append every analysis to the historical Parquet dataset in DIR",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="FILE",
+        help="Record stage timings and API metrics and export them to FILE "
+        "(Prometheus text for *.prom, JSON lines otherwise)",
+    )
+    transport = parser.add_mutually_exclusive_group()
+    transport.add_argument(
+        "--record", metavar="ARCHIVE", help="Record every API exchange to ARCHIVE (gzip JSON lines)"
+    )
+    transport.add_argument(
+        "--replay", metavar="ARCHIVE", help="Serve API responses from ARCHIVE, without network"
+    )
+    parser.add_argument(
+        "--replay-latency", type=float, default=0.0, metavar="SECONDS",
+        help="Simulated latency of every replayed response",
+    )
+    parser.add_argument(
+        "--replay-rate-limit", type=int, metavar="N",
+        help="Simulate a budget of N requests per hour while replaying",
+    )
+    args = parser.parse_args(argv)
+
+    if args.metrics:
+        tracing.enable()
+    if args.record or args.replay:
+        # Without the disk cache, a replay sends exactly the recorded requests
+        configure_cache(None)
+        configure_transport(
+            record=args.record,
+            replay=args.replay,
+            latency=args.replay_latency,
+            rate_limit=args.replay_rate_limit,
+        )
+
+    counts = run_batch(
+        args.input,
+        args.output,
+        output_format=args.format,
+        checkpoint_path=args.checkpoint,
+        workers=args.workers,
+        max_in_flight=args.max_in_flight,
+        use_graphql=args.graphql,
+        snapshot_dir=args.snapshots,
+        history_dir=args.history,
+    )
+    print(
+        f"Done: {counts['ok']} analyzed, {counts['not_found']} not found, "
+        f"{counts['failed']} failed, {counts['skipped']} skipped (checkpoint)."
+    )
+    if args.metrics:
+        tracing.export(args.metrics)
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""
+End-to-end benchmark of the analysis pipeline against a local mock API.
+
+Usage:
+    python app/benchmark.py --sizes 10 1000 100000 --output bench.json
+    python app/benchmark.py --sizes 10 1000 100000 --compare bench.json
+    python app/benchmark.py --cold-start
+
+Each stage (REST, streamed and GraphQL fetch, DataFrame build, every
+aggregation, both charts and the PDF report) is timed separately over several repeats and its peak
+Python memory is measured in a dedicated run with tracemalloc. Results
+are written as JSON; --compare checks a new run against a saved one and
+exits non-zero when a stage got slower than the allowed threshold.
+
+--cold-start instead checks import times and the dashboard's first paint
+in fresh interpreters against fixed budgets, and that the heavy
+libraries stay unloaded until needed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+import pandas as pd
+
+import api_client
+from data_processing import (
+    build_repos_dataframe,
+    get_activity_by_year,
+    get_language_stats,
+    get_top_recent_repos,
+    get_top_repos_by_stars,
+)
+from mock_github import MockGitHubServer
+from plots import plot_language_distribution, plot_repos_by_year, render_png
+from report import generate_pdf_report
+
+
+DEFAULT_SIZES = [10, 1_000, 10_000, 100_000]
+DEFAULT_REPEAT = 3
+
+# A stage is a regression when its best time grows by more than this
+REGRESSION_THRESHOLD = 0.25
+
+BENCH_USER = "bench"
+
+# Cold-start steps, each run in a fresh interpreter from the app directory:
+# (setup code, timed code, budget in seconds, modules that must stay unloaded).
+# first_paint is one run of the dashboard script without an analysis, i.e.
+# what a new session waits for before the title and sidebar show up.
+COLD_START_STEPS = {
+    "import_report": ("", "import report", 0.1, ["reportlab", "pandas"]),
+    "import_plots": ("", "import plots", 1.5, ["matplotlib"]),
+    "first_paint": (
+        "from streamlit.testing.v1 import AppTest\n"
+        "app = AppTest.from_file('main.py', default_timeout=60)",
+        "app.run()",
+        1.0,
+        ["pandas", "pyarrow", "matplotlib", "reportlab"],
+    ),
+}
+
+_COLD_START_TEMPLATE = """
+import json, sys, time
+{setup}
+start = time.perf_counter()
+{step}
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "loaded": [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(fn: Callable, repeat: int) -> tuple[object, dict]:
+    """
+    Run `fn` `repeat` times for timing plus once under tracemalloc.
+    Returns the last result and the measurements.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+
+    # Separate run: tracemalloc slows allocation-heavy code down a lot.
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result, {
+        "time_min_s": min(timings),
+        "time_median_s": statistics.median(timings),
+        "peak_memory_bytes": peak,
+    }
+
+
+def run_size(server: MockGitHubServer, n_repos: int, repeat: int) -> list[dict]:
+    """
+    Benchmark every pipeline stage for a user with `n_repos` repositories.
+    """
+    server.add_user(BENCH_USER, n_repos)
+
+    results = []
+
+    def stage(name: str, fn: Callable):
+        result, stats = measure(fn, repeat)
+        results.append({"size": n_repos, "stage": name, **stats})
+        return result
+
+    def fetch():
+        return api_client.get_user_profile(BENCH_USER), api_client.get_user_repos(BENCH_USER)
+
+    user_profile, repos_json = stage("fetch", fetch)
+
+    def fetch_streamed():
+        return sum(len(page) for page in api_client.iter_user_repo_pages(BENCH_USER))
+
+    # The dashboard and the organization mode build on the streamed pages,
+    # so they must see exactly the repositories the full fetch returns.
+    streamed = stage("fetch_streamed", fetch_streamed)
+    if streamed != len(repos_json):
+        raise RuntimeError(
+            f"Streamed {streamed} repositories for {n_repos}, "
+            f"but get_user_repos returned {len(repos_json)}"
+        )
+    stage("fetch_graphql", lambda: api_client.get_users_bulk([BENCH_USER]))
+    df_repos = stage("build_repos_dataframe", lambda: build_repos_dataframe(repos_json))
+
+    lang_stats = stage("get_language_stats", lambda: get_language_stats(df_repos))
+    stage("get_top_repos_by_stars", lambda: get_top_repos_by_stars(df_repos))
+    stage("get_top_recent_repos", lambda: get_top_recent_repos(df_repos))
+    activity = stage("get_activity_by_year", lambda: get_activity_by_year(df_repos))
+
+    # The uncached renderers, so every repeat draws the chart again
+    lang_png = stage(
+        "plot_language_distribution",
+        lambda: render_png(plot_language_distribution(lang_stats)),
+    )
+    activity_png = stage(
+        "plot_repos_by_year",
+        lambda: render_png(plot_repos_by_year(activity)),
+    )
+
+    stage(
+        "generate_pdf_report",
+        lambda: generate_pdf_report(
+            BENCH_USER, user_profile, df_repos, lang_stats, activity, lang_png, activity_png
+        ),
+    )
+
+    return results
+
+
+def run_benchmark(sizes: list[int], repeat: int = DEFAULT_REPEAT) -> dict:
+    """
+    Benchmark the pipeline at every size against a local mock API and
+    return the results with metadata about the environment.
+    """
+    # Talk to the mock only, without the disk cache or client-side throttling
+    api_client.configure_cache(None)
+    api_client.REQUESTS_PER_SECOND = 1_000_000
+    api_client.REQUEST_BURST = 1_000_000
+    api_client.configure_tokens([])
+
+    # Load the lazily imported libraries first, so that stage timings are
+    # steady-state; their import cost is covered by --cold-start.
+    import matplotlib.figure  # noqa: F401
+    import reportlab.platypus  # noqa: F401
+
+    results = []
+    with MockGitHubServer({BENCH_USER: 0}, rate_limit=10**9) as server:
+        api_client.BASE_URL = server.url
+        api_client.GRAPHQL_URL = f"{server.url}/graphql"
+        for n_repos in sizes:
+            print(f"[benchmark] {n_repos} repositories...", file=sys.stderr)
+            results.extend(run_size(server, n_repos, repeat))
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def run_cold_start(repeat: int = DEFAULT_REPEAT) -> list[dict]:
+    """
+    Run every cold-start step `repeat` times in a fresh interpreter and
+    return its best time, its budget, and the lazy modules it loaded.
+    """
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+
+    results = []
+    for step, (setup, code, budget, lazy) in COLD_START_STEPS.items():
+        script = _COLD_START_TEMPLATE.format(setup=setup, step=code, lazy=lazy)
+        runs = []
+        for _ in range(repeat):
+            output = subprocess.run(
+                [sys.executable, "-c", script],
+                cwd=app_dir,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            runs.append(json.loads(output.strip().splitlines()[-1]))
+
+        seconds = min(run["seconds"] for run in runs)
+        loaded = sorted({m for run in runs for m in run["loaded"]})
+        results.append(
+            {
+                "step": step,
+                "seconds": seconds,
+                "budget_s": budget,
+                "loaded_lazy_modules": loaded,
+                "ok": seconds <= budget and not loaded,
+            }
+        )
+    return results
+
+
+def compare(baseline: dict, current: dict, threshold: float = REGRESSION_THRESHOLD) -> list[dict]:
+    """
+    Return one row per (size, stage) present in both runs with the time
+    and memory ratios (current / baseline) and a regression flag.
+    """
+    previous = {(r["size"], r["stage"]): r for r in baseline["results"]}
+
+    rows = []
+    for result in current["results"]:
+        before = previous.get((result["size"], result["stage"]))
+        if before is None:
+            continue
+        # Best-of-N times are far less noisy than medians on a shared machine
+        time_ratio = result["time_min_s"] / max(before["time_min_s"], 1e-9)
+        memory_ratio = result["peak_memory_bytes"] / max(before["peak_memory_bytes"], 1)
+        rows.append(
+            {
+                "size": result["size"],
+                "stage": result["stage"],
+                "time_ratio": time_ratio,
+                "memory_ratio": memory_ratio,
+                "regression": time_ratio > 1 + threshold,
+            }
+        )
+    return rows
+
+
+def print_results(report: dict) -> None:
+    print(f"{'size':>8}  {'stage':<28} {'median ms':>10} {'min ms':>10} {'peak MiB':>9}")
+    for r in report["results"]:
+        print(
+            f"{r['size']:>8}  {r['stage']:<28} {r['time_median_s'] * 1000:>10.1f} "
+            f"{r['time_min_s'] * 1000:>10.1f} {r['peak_memory_bytes'] / 2**20:>9.1f}"
+        )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the analysis pipeline against a local mock GitHub API."
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+        help="Numbers of repositories to benchmark",
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per stage")
+    parser.add_argument("-o", "--output", help="Write the results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results of a previous run")
+    parser.add_argument(
+        "--threshold", type=float, default=REGRESSION_THRESHOLD,
+        help="Allowed relative slowdown per stage before --compare fails",
+    )
+    parser.add_argument(
+        "--cold-start", action="store_true",
+        help="Only check import times and first paint against their budgets",
+    )
+    args = parser.parse_args(argv)
+
+    if args.cold_start:
+        results = run_cold_start(repeat=args.repeat)
+        print(f"{'step':<16} {'ms':>8} {'budget ms':>10}  lazily loaded")
+        for r in results:
+            flag = "" if r["ok"] else "  OVER BUDGET"
+            print(
+                f"{r['step']:<16} {r['seconds'] * 1000:>8.0f} {r['budget_s'] * 1000:>10.0f}  "
+                f"{', '.join(r['loaded_lazy_modules']) or '-'}{flag}"
+            )
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump({"cold_start": results}, f, indent=2)
+        return 0 if all(r["ok"] for r in results) else 1
+
+    report = run_benchmark(args.sizes, repeat=args.repeat)
+    print_results(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if not args.compare:
+        return 0
+
+    with open(args.compare, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    rows = compare(baseline, report, threshold=args.threshold)
+    print(f"\n{'size':>8}  {'stage':<28} {'time x':>7} {'memory x':>9}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['size']:>8}  {row['stage']:<28} {row['time_ratio']:>7.2f} "
+            f"{row['memory_ratio']:>9.2f}{flag}"
+        )
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,53 +1,130 @@
+from collections import Counter
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict
+from typing import Iterable, List, Dict, Optional
 
+import numpy as np
 import pandas as pd
 
+import tracing
 
-def build_repos_dataframe(repos_json: List[Dict]) -> pd.DataFrame:
+
+# Fields kept from the API payload, mapped to cleaner column names
+REPO_COLUMNS = {
+    "name": "name",
+    "full_name": "full_name",
+    "description": "description",
+    "language": "language",
+    "stargazers_count": "stars",
+    "forks_count": "forks",
+    "created_at": "created_at",
+    "pushed_at": "pushed_at",
+    "html_url": "html_url",
+}
+
+# GitHub always returns timestamps in this exact ISO-8601 form
+GITHUB_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# Repositories pushed to within this many days count as active (comparisons)
+ACTIVE_DAYS = 365
+
+
+@tracing.traced("data.build_repos_dataframe")
+def build_repos_dataframe(
+    repos_json: List[Dict], arrow_strings: bool = False
+) -> pd.DataFrame:
     """
     Build a clean pandas DataFrame from the list of repositories
     returned by the GitHub API.
+
+    Only the needed fields are read (nested owner/license/permissions
+    objects are never flattened) and columns get compact dtypes:
+    categorical language, int32 counts and UTC timestamps parsed with a
+    fixed format. Set arrow_strings=True to store the text columns as
+    pyarrow-backed strings.
     """
-    if not repos_json:
-        return pd.DataFrame(
-            columns=[
-                "name",
-                "full_name",
-                "description",
-                "language",
-                "stargazers_count",
-                "forks_count",
-                "created_at",
-                "pushed_at",
-                "html_url",
-            ]
-        )
+    fields = list(REPO_COLUMNS)
+    rows = [tuple(repo.get(field) for field in fields) for repo in repos_json]
+    values = list(zip(*rows)) if rows else [()] * len(fields)
+    raw = dict(zip(REPO_COLUMNS.values(), values))
 
-    df = pd.json_normalize(repos_json)
+    string_dtype = "string[pyarrow]" if arrow_strings else object
 
-    # Keep only relevant columns and rename them to cleaner names
-    columns_mapping = {
-        "name": "name",
-        "full_name": "full_name",
-        "description": "description",
-        "language": "language",
-        "stargazers_count": "stars",
-        "forks_count": "forks",
-        "created_at": "created_at",
-        "pushed_at": "pushed_at",
-        "html_url": "html_url",
-    }
+    df = pd.DataFrame(
+        {
+            "name": pd.array(raw["name"], dtype=string_dtype),
+            "full_name": pd.array(raw["full_name"], dtype=string_dtype),
+            "description": pd.array(raw["description"], dtype=string_dtype),
+            "language": pd.Categorical(raw["language"]),
+            "stars": pd.array(raw["stars"], dtype="float64").fillna(0).astype("int32"),
+            "forks": pd.array(raw["forks"], dtype="float64").fillna(0).astype("int32"),
+            "created_at": pd.to_datetime(
+                raw["created_at"], format=GITHUB_TIME_FORMAT, utc=True, errors="coerce"
+            ),
+            "pushed_at": pd.to_datetime(
+                raw["pushed_at"], format=GITHUB_TIME_FORMAT, utc=True, errors="coerce"
+            ),
+            "html_url": pd.array(raw["html_url"], dtype=string_dtype),
+        }
+    )
 
-    df = df[list(columns_mapping.keys())].rename(columns=columns_mapping)
+    return df
 
-    # Convert datetime columns
-    for col in ["created_at", "pushed_at"]:
-        df[col] = pd.to_datetime(df[col], errors="coerce")
 
-    return df
+def drop_duplicate_repos(repos_json: List[Dict]) -> List[Dict]:
+    """
+    Keep one entry per full_name, the one with the newest updated_at, in
+    first-seen order.
+
+    Pages of a listing sorted by update time are fetched concurrently, so
+    a repository updated during the fetch can show up on two pages.
+    """
+    latest = {}
+    for repo in repos_json:
+        full_name = repo.get("full_name")
+        kept = latest.get(full_name)
+        if kept is None or (repo.get("updated_at") or "") > (kept.get("updated_at") or ""):
+            latest[full_name] = repo
+    if len(latest) == len(repos_json):
+        return repos_json
+    return list(latest.values())
+
 
+@tracing.traced("data.merge_repos_dataframe")
+def merge_repos_dataframe(base: pd.DataFrame, changed: pd.DataFrame) -> pd.DataFrame:
+    """
+    Merge freshly fetched repositories into an existing repository frame.
+
+    Rows of `base` with the same full_name as a row of `changed` are
+    replaced; new repositories are added. Only the changed rows need to
+    be built from JSON, the rest of the frame is reused as is. Duplicate
+    full_names already in `base` are dropped (the first row is kept).
+    """
+    if base["full_name"].duplicated().any():
+        base = base.drop_duplicates("full_name", ignore_index=True)
+    if changed.empty:
+        return base
+    if base.empty:
+        return changed
+
+    kept = base[~base["full_name"].isin(changed["full_name"])]
+    return _concat_repos([changed, kept])
+
+
+def _concat_repos(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate repository frames, re-deriving the language categories
+    (frames usually carry different category sets).
+    """
+    merged = pd.concat(
+        [df.assign(language=df["language"].astype(object)) for df in frames],
+        ignore_index=True,
+    )
+    merged["language"] = merged["language"].astype("category")
+    return merged
 
+
+@tracing.traced("data.get_language_stats")
 def get_language_stats(df: pd.DataFrame) -> pd.DataFrame:
     """
     Return a DataFrame with the number of repos per main language.
@@ -55,16 +132,26 @@ def get_language_stats(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return pd.DataFrame(columns=["language", "repo_count"])
 
-    lang_counts = (
-        df["language"]
-        .fillna("Unknown")
-        .value_counts()
-        .reset_index()
+    language = df["language"]
+    if not isinstance(language.dtype, pd.CategoricalDtype):
+        language = language.astype("category")
+
+    # Count the category codes in one vectorized pass; code -1 is a
+    # missing language and is reported as "Unknown".
+    counts = np.bincount(language.cat.codes.to_numpy() + 1,
+                         minlength=len(language.cat.categories) + 1)
+    names = np.array(["Unknown"] + list(language.cat.categories), dtype=object)
+
+    used = counts > 0
+    lang_counts = pd.DataFrame(
+        {"language": names[used], "repo_count": counts[used]}
     )
-    lang_counts.columns = ["language", "repo_count"]
-    return lang_counts
+    return lang_counts.sort_values(
+        "repo_count", ascending=False, kind="stable"
+    ).reset_index(drop=True)
 
 
+@tracing.traced("data.get_top_repos_by_stars")
 def get_top_repos_by_stars(df: pd.DataFrame, n: int = 5) -> pd.DataFrame:
     """
     Return the top N repositories sorted by star count.
@@ -72,9 +159,10 @@ def get_top_repos_by_stars(df: pd.DataFrame, n: int = 5) -> pd.DataFrame:
     if df.empty:
         return df
 
-    return df.sort_values(by="stars", ascending=False).head(n)
+    return df.nlargest(n, "stars")
 
 
+@tracing.traced("data.get_top_recent_repos")
 def get_top_recent_repos(df: pd.DataFrame, n: int = 5) -> pd.DataFrame:
     """
     Return the top N most recently updated repositories (by pushed_at).
@@ -82,9 +170,10 @@ def get_top_recent_repos(df: pd.DataFrame, n: int = 5) -> pd.DataFrame:
     if df.empty:
         return df
 
-    return df.sort_values(by="pushed_at", ascending=False).head(n)
+    return df.nlargest(n, "pushed_at")
 
 
+@tracing.traced("data.get_activity_by_year")
 def get_activity_by_year(df: pd.DataFrame) -> pd.DataFrame:
     """
     Return a DataFrame with repository count by creation year.
@@ -92,18 +181,340 @@ def get_activity_by_year(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return pd.DataFrame(columns=["year", "repo_count"])
 
-    df = df.copy()
-    df["year"] = df["created_at"].dt.year
-
     activity = (
-        df.groupby("year")
-        .size()
+        df["created_at"]
+        .dt.year
+        .value_counts()
+        .sort_index()
+        .rename_axis("year")
         .reset_index(name="repo_count")
-        .sort_values("year")
     )
+    activity["year"] = activity["year"].astype(int)
     return activity
 
 
+@tracing.traced("data.get_language_bytes_stats")
+def get_language_bytes_stats(languages_by_repo: Dict[str, Dict[str, int]]) -> pd.DataFrame:
+    """
+    Return a DataFrame with the total bytes of code per language across
+    all repositories, and each language's share of the total.
+    """
+    totals = Counter()
+    for languages in languages_by_repo.values():
+        totals.update(languages)
+
+    if not totals:
+        return pd.DataFrame(columns=["language", "bytes", "share"])
+
+    lang_bytes = pd.DataFrame(totals.most_common(), columns=["language", "bytes"])
+    lang_bytes["share"] = (lang_bytes["bytes"] / lang_bytes["bytes"].sum()).round(4)
+    return lang_bytes
+
+
+@dataclass(frozen=True)
+class RepoSummary:
+    """
+    All aggregates shown for a set of repositories, computed together.
+    """
+
+    repo_count: int
+    total_stars: int
+    total_forks: int
+    lang_stats: pd.DataFrame
+    activity: pd.DataFrame
+    top_stars: pd.DataFrame
+    top_recent: pd.DataFrame
+    # Row positions of the repository frame ordered by stars (descending);
+    # empty when the summary was folded from a stream of pages
+    stars_order: np.ndarray
+
+
+@tracing.traced("data.summarize_repos")
+def summarize_repos(df: pd.DataFrame, n: int = 5) -> RepoSummary:
+    """
+    Compute every repository aggregate in a minimal number of vectorized
+    passes: counts via bincount/value_counts, top-N via partial selection
+    (nlargest) and a single argsort of the stars column for the table
+    order. The input frame is never copied.
+    """
+    stars = df["stars"].to_numpy()
+
+    return RepoSummary(
+        repo_count=len(df),
+        total_stars=int(stars.sum()),
+        total_forks=int(df["forks"].to_numpy().sum()),
+        lang_stats=get_language_stats(df),
+        activity=get_activity_by_year(df),
+        top_stars=get_top_repos_by_stars(df, n=n),
+        top_recent=get_top_recent_repos(df, n=n),
+        stars_order=np.argsort(-stars.astype("int64"), kind="stable"),
+    )
+
+
+@tracing.traced("data.update_summary")
+def update_summary(
+    summary: RepoSummary,
+    base: pd.DataFrame,
+    changed: pd.DataFrame,
+    merged: pd.DataFrame,
+    n: int = 5,
+) -> RepoSummary:
+    """
+    Update the summary of `base` for merged = merge_repos_dataframe(base,
+    changed), looking only at the replaced and changed rows.
+
+    Counts and totals are adjusted by the rows leaving and entering the
+    frame; a top-N list is re-selected from its previous entries plus the
+    changed rows (over the whole merged frame only when one of its entries
+    was replaced). The table order is one argsort of the merged stars.
+    """
+    if base.empty:
+        return summarize_repos(merged, n=n)
+
+    replaced = base[base["full_name"].isin(changed["full_name"])]
+
+    languages = _adjust_counts(
+        summary.lang_stats, get_language_stats(replaced), get_language_stats(changed), "language"
+    )
+    # Same order as get_language_stats: by count, ties in category order
+    names = sorted(languages, key=lambda name: (name != "Unknown", name))
+    lang_stats = pd.DataFrame(
+        {"language": names, "repo_count": [languages[name] for name in names]}
+    ).sort_values("repo_count", ascending=False, kind="stable").reset_index(drop=True)
+
+    years = _adjust_counts(
+        summary.activity, get_activity_by_year(replaced), get_activity_by_year(changed), "year"
+    )
+
+    return RepoSummary(
+        repo_count=len(merged),
+        total_stars=summary.total_stars
+        - int(replaced["stars"].to_numpy().sum())
+        + int(changed["stars"].to_numpy().sum()),
+        total_forks=summary.total_forks
+        - int(replaced["forks"].to_numpy().sum())
+        + int(changed["forks"].to_numpy().sum()),
+        lang_stats=lang_stats,
+        activity=pd.DataFrame(sorted(years.items()), columns=["year", "repo_count"]),
+        top_stars=_update_top(summary.top_stars, changed, merged, n, "stars"),
+        top_recent=_update_top(summary.top_recent, changed, merged, n, "pushed_at"),
+        stars_order=np.argsort(-merged["stars"].to_numpy().astype("int64"), kind="stable"),
+    )
+
+
+def _adjust_counts(
+    current: pd.DataFrame, removed: pd.DataFrame, added: pd.DataFrame, key: str
+) -> Dict:
+    counts = Counter(dict(zip(current[key], current["repo_count"])))
+    counts.subtract(dict(zip(removed[key], removed["repo_count"])))
+    counts.update(dict(zip(added[key], added["repo_count"])))
+    return {value: int(count) for value, count in counts.items() if count > 0}
+
+
+def _update_top(
+    top: pd.DataFrame, changed: pd.DataFrame, merged: pd.DataFrame, n: int, column: str
+) -> pd.DataFrame:
+    listed = top["full_name"].isin(changed["full_name"])
+    if len(top) >= n and listed.any():
+        # A listed repository may have dropped, and the one that takes its
+        # place is not among the candidates kept from the previous list
+        return merged.nlargest(n, column).reset_index(drop=True)
+    return _concat_repos([changed, top[~listed]]).nlargest(n, column).reset_index(drop=True)
+
+
+@tracing.traced("data.concat_user_frames")
+def concat_user_frames(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Stack per-user repository frames (from build_repos_dataframe) into a
+    single frame with a leading categorical "user" column.
+
+    Every user becomes a category, in input order, even without any
+    repository, so grouped metrics keep one row per user.
+    """
+    users = list(frames)
+    non_empty = [frames[user] for user in users if len(frames[user])]
+    merged = _concat_repos(non_empty) if non_empty else build_repos_dataframe([])
+
+    codes = np.repeat(np.arange(len(users)), [len(frames[user]) for user in users])
+    merged.insert(0, "user", pd.Categorical.from_codes(codes, categories=users))
+    return merged
+
+
+@dataclass(frozen=True)
+class ComparisonSummary:
+    """
+    Cross-user aggregates of a comparison.
+    """
+
+    # One row per user, ranked by stars, then forks, then recency
+    table: pd.DataFrame
+    # Users x languages: share of each user's repositories (ranked order)
+    language_mix: pd.DataFrame
+    # Users x creation years: number of repositories created (ranked order)
+    activity: pd.DataFrame
+
+
+@tracing.traced("data.compare_users")
+def compare_users(
+    df: pd.DataFrame,
+    profiles: Optional[Dict[str, Dict]] = None,
+    now: Optional[pd.Timestamp] = None,
+) -> ComparisonSummary:
+    """
+    Compute the comparison metrics of every user at once from a frame
+    built by concat_user_frames: one groupby pass per metric family
+    instead of a loop over users.
+
+    `profiles` (username -> profile payload) adds a followers column.
+    """
+    now = now if now is not None else pd.Timestamp.now(tz="UTC")
+    users = df["user"].cat.categories
+
+    grouped = df.groupby("user", observed=False, sort=False)
+    table = grouped.agg(
+        repo_count=("name", "size"),
+        total_stars=("stars", "sum"),
+        total_forks=("forks", "sum"),
+        max_stars=("stars", "max"),
+        last_pushed_at=("pushed_at", "max"),
+    ).reindex(users)
+    table["active_repos"] = (
+        (df["pushed_at"] >= now - pd.Timedelta(days=ACTIVE_DAYS))
+        .groupby(df["user"], observed=False)
+        .sum()
+    )
+
+    language = df["language"]
+    if "Unknown" not in language.cat.categories:
+        language = language.cat.add_categories("Unknown")
+    language_counts = (
+        df.groupby(["user", language.fillna("Unknown")], observed=False)
+        .size()
+        .unstack(fill_value=0)
+        .reindex(users, fill_value=0)
+    )
+    language_counts = language_counts.loc[:, language_counts.sum() > 0]
+    language_counts.columns = language_counts.columns.astype(object)
+    repo_totals = language_counts.sum(axis=1)
+
+    activity = (
+        df.groupby(["user", df["created_at"].dt.year.rename("year")], observed=False)
+        .size()
+        .unstack(fill_value=0)
+        .reindex(users, fill_value=0)
+    )
+    activity.columns = activity.columns.astype(int)
+
+    # idxmax has nothing to pick from when no user has any repository
+    if language_counts.columns.empty:
+        table["top_language"] = np.nan
+    else:
+        table["top_language"] = language_counts.idxmax(axis=1).where(repo_totals > 0)
+    table["language_count"] = (language_counts > 0).sum(axis=1)
+    table["avg_stars"] = (table["total_stars"] / table["repo_count"].replace(0, np.nan)).round(1)
+    table["days_since_push"] = (now - table["last_pushed_at"]).dt.days
+    for column in ("repo_count", "total_stars", "total_forks", "max_stars", "active_repos"):
+        table[column] = table[column].fillna(0).astype("int64")
+
+    if profiles is not None:
+        table["followers"] = [(profiles.get(user) or {}).get("followers") for user in users]
+
+    table = table.sort_values(
+        ["total_stars", "total_forks", "last_pushed_at"],
+        ascending=False,
+        kind="stable",
+        na_position="last",
+    )
+    table.insert(0, "rank", np.arange(1, len(table) + 1))
+    ranked = table.index
+
+    language_mix = language_counts.div(repo_totals.replace(0, np.nan), axis=0).fillna(0.0)
+    return ComparisonSummary(
+        table=table.rename_axis("user").reset_index(),
+        language_mix=language_mix.reindex(ranked).rename_axis(index="user", columns="language"),
+        activity=activity.reindex(ranked).rename_axis(index="user", columns="year"),
+    )
+
+
+class RepoAggregator:
+    """
+    Fold pages of repositories into running aggregates.
+
+    Used for organization-scale analysis: each page is turned into a small
+    DataFrame, merged into the language / year counters and the top-N
+    lists, and then dropped, so memory depends on the number of distinct
+    languages and years, not on the number of repositories.
+    """
+
+    def __init__(self, n: int = 5):
+        self.n = n
+        self.repo_count = 0
+        self.total_stars = 0
+        self.total_forks = 0
+        self._languages = Counter()
+        self._years = Counter()
+        self._top_stars = build_repos_dataframe([])
+        self._top_recent = build_repos_dataframe([])
+
+    @tracing.traced("data.RepoAggregator.update")
+    def update(self, repos_json: List[Dict]) -> None:
+        """
+        Fold one page of repositories (as returned by the API) in.
+        """
+        if not repos_json:
+            return
+
+        df = build_repos_dataframe(repos_json)
+
+        self.repo_count += len(df)
+        self.total_stars += int(df["stars"].to_numpy().sum())
+        self.total_forks += int(df["forks"].to_numpy().sum())
+
+        lang_stats = get_language_stats(df)
+        self._languages.update(dict(zip(lang_stats["language"], lang_stats["repo_count"])))
+        activity = get_activity_by_year(df)
+        self._years.update(dict(zip(activity["year"], activity["repo_count"])))
+
+        self._top_stars = self._merge_top(self._top_stars, df, "stars")
+        self._top_recent = self._merge_top(self._top_recent, df, "pushed_at")
+
+    def update_all(self, pages: Iterable[List[Dict]]) -> "RepoAggregator":
+        """
+        Fold every page of an iterable in and return self.
+        """
+        for page in pages:
+            self.update(page)
+        return self
+
+    def summary(self) -> RepoSummary:
+        """
+        Return the aggregates collected so far as a RepoSummary.
+        """
+        lang_stats = pd.DataFrame(
+            self._languages.most_common(), columns=["language", "repo_count"]
+        )
+        activity = pd.DataFrame(
+            sorted(self._years.items()), columns=["year", "repo_count"]
+        )
+
+        return RepoSummary(
+            repo_count=self.repo_count,
+            total_stars=self.total_stars,
+            total_forks=self.total_forks,
+            lang_stats=lang_stats,
+            activity=activity,
+            top_stars=self._top_stars.reset_index(drop=True),
+            top_recent=self._top_recent.reset_index(drop=True),
+            stars_order=np.empty(0, dtype=np.int64),
+        )
+
+    def _merge_top(self, current: pd.DataFrame, df: pd.DataFrame, column: str) -> pd.DataFrame:
+        candidates = df.nlargest(self.n, column)
+        if current.empty:
+            return candidates
+        return _concat_repos([current, candidates]).nlargest(self.n, column)
+
+
 if __name__ == "__main__":
     # Small manual test, will be used together with api_client
     from api_client import get_user_repos
@@ -0,0 +1,237 @@
+import glob
+import os
+import threading
+import uuid
+from datetime import date, datetime, timezone
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+
+
+# Root of the historical datasets (profiles/ and repos/ below it),
+# overridable with GITHUB_ANALYZER_HISTORY_DIR
+HISTORY_DIR = os.environ.get("GITHUB_ANALYZER_HISTORY_DIR") or ".history"
+
+# Files live under <dataset>/user=<login>/date=<day>/, so a query lists and
+# opens the directory of one user only, whatever the size of the history.
+PARTITIONING = ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive")
+
+PROFILE_SCHEMA = pa.schema(
+    [
+        ("snapshot_at", pa.timestamp("us", tz="UTC")),
+        ("public_repos", pa.int64()),
+        ("followers", pa.int64()),
+        ("following", pa.int64()),
+        ("repo_count", pa.int64()),
+        ("total_stars", pa.int64()),
+        ("total_forks", pa.int64()),
+        ("date", pa.string()),
+    ]
+)
+
+REPO_SCHEMA = pa.schema(
+    [
+        ("snapshot_at", pa.timestamp("us", tz="UTC")),
+        ("name", pa.string()),
+        ("language", pa.string()),
+        ("stars", pa.int32()),
+        ("forks", pa.int32()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+        ("pushed_at", pa.timestamp("us", tz="UTC")),
+        ("date", pa.string()),
+    ]
+)
+
+# Memory-mapped local reads: Parquet pages are paged in by the OS instead
+# of being copied into Python-owned buffers.
+_filesystem = fs.LocalFileSystem(use_mmap=True)
+
+# Datasets already checked for the old date-first layout in this process
+_migrated = set()
+_migrate_lock = threading.Lock()
+
+
+def _user_path(path: str, username: str) -> str:
+    return os.path.join(path, f"user={username.lower()}")
+
+
+def _migrate_legacy_layout(path: str) -> None:
+    # Histories written before the user-first layout keep their files under
+    # date=<day>/user=<login>/; move them to user=<login>/date=<day>/ once.
+    with _migrate_lock:
+        if path in _migrated:
+            return
+        for old_dir in glob.glob(os.path.join(path, "date=*", "user=*")):
+            day_dir, user_dir = os.path.split(old_dir)
+            new_dir = os.path.join(path, user_dir, os.path.basename(day_dir))
+            os.makedirs(new_dir, exist_ok=True)
+            for file_path in glob.glob(os.path.join(old_dir, "part-*.parquet")):
+                os.replace(file_path, os.path.join(new_dir, os.path.basename(file_path)))
+        for day_dir in glob.glob(os.path.join(path, "date=*")):
+            for old_dir in glob.glob(os.path.join(day_dir, "user=*")):
+                if not os.listdir(old_dir):
+                    os.rmdir(old_dir)
+            if not os.listdir(day_dir):
+                os.rmdir(day_dir)
+        _migrated.add(path)
+
+
+def _write(table: pa.Table, path: str, username: str) -> None:
+    # Every table written here holds a single (user, date) partition. The
+    # file is written under a dot-name, which dataset discovery skips, and
+    # renamed into place, so a crash mid-write never leaves a truncated
+    # part file behind for the trend queries to trip over.
+    _migrate_legacy_layout(path)
+    directory = os.path.join(
+        _user_path(path, username), f"date={table['date'][0].as_py()}"
+    )
+    os.makedirs(directory, exist_ok=True)
+
+    file_name = f"part-{uuid.uuid4().hex}-0.parquet"
+    tmp_path = os.path.join(directory, f".{file_name}.tmp")
+    pq.write_table(table.drop_columns(["date"]), tmp_path)
+    os.replace(tmp_path, os.path.join(directory, file_name))
+
+
+def _dataset(path: str, username: str, schema: pa.Schema) -> Optional[ds.Dataset]:
+    _migrate_legacy_layout(path)
+    try:
+        return ds.dataset(
+            _user_path(path, username),
+            schema=schema,
+            format="parquet",
+            partitioning=PARTITIONING,
+            filesystem=_filesystem,
+        )
+    except FileNotFoundError:
+        return None
+
+
+def append_snapshot(
+    username: str,
+    user_profile: dict,
+    df_repos: pd.DataFrame,
+    history_dir: str = HISTORY_DIR,
+    snapshot_at: Optional[datetime] = None,
+) -> None:
+    """
+    Append a profile snapshot and its repository frame to the history.
+
+    Rows go to two Parquet datasets (profiles/ and repos/), partitioned by
+    user and then date, so trend queries only open the files of one user.
+    """
+    snapshot_at = snapshot_at or datetime.now(timezone.utc)
+    day = snapshot_at.date().isoformat()
+
+    profile = pa.Table.from_pylist(
+        [
+            {
+                "snapshot_at": snapshot_at,
+                "public_repos": user_profile.get("public_repos"),
+                "followers": user_profile.get("followers"),
+                "following": user_profile.get("following"),
+                "repo_count": len(df_repos),
+                "total_stars": int(df_repos["stars"].sum()),
+                "total_forks": int(df_repos["forks"].sum()),
+                "date": day,
+            }
+        ],
+        schema=PROFILE_SCHEMA,
+    )
+    _write(profile, f"{history_dir}/profiles", username)
+
+    if df_repos.empty:
+        return
+
+    repos = pa.table(
+        {
+            "snapshot_at": pa.array([snapshot_at] * len(df_repos), pa.timestamp("us", tz="UTC")),
+            "name": pa.array(df_repos["name"].astype(object), pa.string()),
+            "language": pa.array(df_repos["language"].astype(object), pa.string()),
+            "stars": pa.array(df_repos["stars"], pa.int32()),
+            "forks": pa.array(df_repos["forks"], pa.int32()),
+            "created_at": pa.array(df_repos["created_at"], pa.timestamp("us", tz="UTC")),
+            "pushed_at": pa.array(df_repos["pushed_at"], pa.timestamp("us", tz="UTC")),
+            "date": pa.array([day] * len(df_repos), pa.string()),
+        },
+        schema=REPO_SCHEMA,
+    )
+    _write(repos, f"{history_dir}/repos", username)
+
+
+def _filter(start: Optional[date], end: Optional[date]):
+    # date is a partition key, so these predicates prune whole directories
+    # before any file is opened.
+    expression = None
+    if start is not None:
+        expression = ds.field("date") >= start.isoformat()
+    if end is not None:
+        upper = ds.field("date") <= end.isoformat()
+        expression = upper if expression is None else expression & upper
+    return expression
+
+
+def query_trends(
+    username: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    history_dir: str = HISTORY_DIR,
+) -> pd.DataFrame:
+    """
+    Return one row per stored snapshot of a user with its repo count,
+    stars, forks and followers, ordered by time.
+    """
+    columns = ["snapshot_at", "repo_count", "total_stars", "total_forks", "followers"]
+
+    dataset = _dataset(f"{history_dir}/profiles", username, PROFILE_SCHEMA)
+    if dataset is None:
+        return pd.DataFrame(columns=columns)
+
+    table = dataset.to_table(columns=columns, filter=_filter(start, end))
+    return table.sort_by("snapshot_at").to_pandas()
+
+
+def query_language_trends(
+    username: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    history_dir: str = HISTORY_DIR,
+) -> pd.DataFrame:
+    """
+    Return the number of repositories per language for every stored
+    snapshot of a user, as a wide frame (one column per language) indexed
+    by snapshot time.
+
+    Only the snapshot_at and language columns are read, and the grouping
+    is done in Arrow, so the repository history is never materialized in
+    pandas.
+    """
+    dataset = _dataset(f"{history_dir}/repos", username, REPO_SCHEMA)
+    if dataset is None:
+        return pd.DataFrame()
+
+    table = dataset.to_table(
+        columns=["snapshot_at", "language"], filter=_filter(start, end)
+    )
+    if table.num_rows == 0:
+        return pd.DataFrame()
+
+    table = table.set_column(
+        1, "language", pc.fill_null(table["language"], "Unknown")
+    )
+    counts = table.group_by(["snapshot_at", "language"]).aggregate(
+        [("language", "count")]
+    )
+
+    return (
+        counts.to_pandas()
+        .pivot(index="snapshot_at", columns="language", values="language_count")
+        .fillna(0)
+        .astype(int)
+        .sort_index()
+    )
@@ -0,0 +1,131 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    headers TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+)
+"""
+
+# Only the headers needed to revalidate an entry or to keep paginating
+# from it are persisted.
+STORED_HEADERS = ("ETag", "Last-Modified", "Link", "Content-Type")
+
+
+class HttpCache:
+    """
+    Small on-disk cache of GitHub API responses backed by SQLite.
+
+    Each entry stores the response body together with its `ETag`,
+    `Last-Modified` and `Link` headers, so it can be revalidated with a
+    conditional request later on. Entries younger than `ttl` seconds are
+    considered fresh and can be served without touching the network.
+    When the total body size exceeds `max_bytes`, the least recently used
+    entries are evicted.
+
+    A single connection is shared behind a lock, so one instance can be
+    used from several threads at once.
+    """
+
+    def __init__(self, path: str, ttl: float = 300, max_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(SCHEMA)
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Return the cached entry for `key` as a dict with `body`, `headers`,
+        `stored_at` and `fresh`, or None if there is no entry.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, headers, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+
+        body, headers, stored_at = row
+        return {
+            "body": body,
+            "headers": json.loads(headers),
+            "stored_at": stored_at,
+            "fresh": now - stored_at < self.ttl,
+        }
+
+    def put(self, key: str, body: bytes, headers) -> None:
+        """
+        Store a response body and its relevant headers under `key`.
+        """
+        kept = {name: headers[name] for name in STORED_HEADERS if name in headers}
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, body, headers, stored_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, body, json.dumps(kept), now, now, len(body)),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, key: str) -> None:
+        """
+        Mark an entry as fresh again (used after a 304 Not Modified).
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, key),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """
+        Remove every cached entry.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        # Caller must hold the lock.
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        victims = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
@@ -1,15 +1,29 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
 import streamlit as st
 
-from api_client import get_user_profile, get_user_repos
-from data_processing import (
-    build_repos_dataframe,
-    get_language_stats,
-    get_top_repos_by_stars,
-    get_top_recent_repos,
-    get_activity_by_year,
-)
-from plots import plot_language_distribution, plot_repos_by_year
-from report import generate_pdf_report
+import tracing
+
+# The analysis modules pull in pandas, pyarrow, matplotlib and ReportLab,
+# which take seconds to import. They are imported where first needed, so
+# the landing page (title and sidebar) renders without any of them.
+
+
+# Seconds the language breakdowns are reused before GitHub is queried again
+# (analyses themselves live in the shared cache of analysis_cache.py)
+ANALYSIS_TTL = 600
+
+# Minimum seconds between two refreshes of the streaming repository overview
+PROGRESS_INTERVAL = 0.5
+
+# Threads rendering charts in the background
+CHART_WORKERS = 2
+
+# Most profiles compared at once, and users shown in the comparison charts
+MAX_COMPARISON_USERS = 200
+COMPARISON_CHART_USERS = 20
 
 
 st.set_page_config(
@@ -18,6 +32,524 @@ st.set_page_config(
     layout="wide",
 )
 
+
+@st.cache_resource
+def get_chart_executor() -> ThreadPoolExecutor:
+    """
+    Return the thread pool rendering charts while the page is drawn.
+    """
+    return ThreadPoolExecutor(max_workers=CHART_WORKERS, thread_name_prefix="charts")
+
+
+def cached_analysis(account_type: str, name: str) -> Optional[dict]:
+    """
+    Return the stored analysis of an account, or None.
+    """
+    from analysis_cache import get_analysis_cache
+
+    tracing.count("cache_lookups_total", cache="analysis")
+    return get_analysis_cache().get((account_type, name.lower()))
+
+
+def load_profile(account_type: str, name: str) -> dict:
+    """
+    Fetch the profile of a user or organization.
+
+    Raises:
+        ValueError: If the account is not found (404).
+        RuntimeError: For other non-success HTTP responses.
+    """
+    from api_client import get_org_profile, get_user_profile
+
+    if account_type == "Organization":
+        return get_org_profile(name)
+    return get_user_profile(name)
+
+
+def stream_analysis(
+    account_type: str,
+    name: str,
+    user_profile: dict,
+    on_progress: Callable,
+) -> dict:
+    """
+    Fetch an account's repositories page by page, calling
+    on_progress(aggregator) as each page arrives, then compute and store
+    the full analysis.
+
+    Organizations only keep the running aggregates, so their full
+    repository list is never held in a single DataFrame.
+
+    Raises:
+        ValueError: If the account is not found (404).
+        RuntimeError: For other non-success HTTP responses.
+    """
+    from analysis_cache import get_analysis_cache
+    from api_client import iter_org_repo_pages, iter_user_repo_pages
+    from data_processing import RepoAggregator, build_repos_dataframe, summarize_repos
+    from history import append_snapshot
+    from table_view import RepoTableView
+
+    tracing.count("cache_misses_total", cache="analysis")
+    aggregator = RepoAggregator(n=5)
+
+    if account_type == "Organization":
+        for page in iter_org_repo_pages(name):
+            aggregator.update(page)
+            on_progress(aggregator)
+
+        analysis = {
+            "user_profile": user_profile,
+            "df_repos": None,
+            "summary": aggregator.summary(),
+        }
+    else:
+        repos_json = []
+        for page in iter_user_repo_pages(name):
+            repos_json.extend(page)
+            aggregator.update(page)
+            on_progress(aggregator)
+
+        df_repos = build_repos_dataframe(repos_json)
+
+        # Runs once per fetch (not per rerun), so each fetch is one history point.
+        # A failed write only costs that point, never the analysis.
+        try:
+            append_snapshot(name, user_profile, df_repos)
+        except (OSError, ValueError) as e:
+            st.warning(f"History snapshot of {name} not written: {e}")
+
+        analysis = {
+            "user_profile": user_profile,
+            "df_repos": df_repos,
+            "summary": summarize_repos(df_repos, n=5),
+            "table_view": RepoTableView(df_repos),
+            # Identifies this fetch (and its history point) for load_trends
+            "fetched_at": time.time(),
+        }
+
+    # Stored read-only and shared with every other session
+    return get_analysis_cache().put((account_type, name.lower()), analysis)
+
+
+def set_analyzed(analyzed: tuple[str, str]):
+    """
+    Remember the account (or comparison) shown by this session. PDF jobs
+    belong to the previous one, so they are dropped when it changes.
+    """
+    if st.session_state.get("analyzed") != analyzed:
+        st.session_state.pop("report_job", None)
+        st.session_state.pop("comparison_job", None)
+    st.session_state["analyzed"] = analyzed
+
+
+def parse_usernames(text: str) -> list[str]:
+    """
+    Split a comma / whitespace separated list of usernames, dropping
+    duplicates (case-insensitively) while keeping the input order.
+    """
+    names = {}
+    for name in text.replace(",", " ").split():
+        names.setdefault(name.lower(), name)
+    return list(names.values())
+
+
+def load_comparison(usernames: list[str]) -> dict:
+    """
+    Fetch every user of a comparison and compute the ranked metrics of all
+    of them at once, from one frame holding every repository.
+
+    The result is stored with the single-account analyses, keyed by the
+    set of usernames (order and case do not matter).
+
+    Raises:
+        RuntimeError: For non-success HTTP responses.
+    """
+    from analysis_cache import get_analysis_cache
+    from api_client import get_users
+    from data_processing import build_repos_dataframe, compare_users, concat_user_frames
+
+    key = ("Comparison", ",".join(sorted(name.lower() for name in usernames)))
+    tracing.count("cache_lookups_total", cache="analysis")
+    comparison = get_analysis_cache().get(key)
+    if comparison is not None:
+        return comparison
+
+    tracing.count("cache_misses_total", cache="analysis")
+    users = get_users(usernames)
+    frames = {
+        profile.get("login") or name: build_repos_dataframe(repos)
+        for name, (profile, repos) in users.items()
+    }
+    profiles = {profile.get("login") or name: profile for name, (profile, _) in users.items()}
+
+    comparison = {
+        "summary": compare_users(concat_user_frames(frames), profiles=profiles),
+        "missing": [name for name in usernames if name not in users],
+    }
+    return get_analysis_cache().put(key, comparison)
+
+
+@st.cache_data(ttl=ANALYSIS_TTL, show_spinner="Fetching language breakdown per repository...")
+def load_language_bytes(username: str, _df_repos):
+    """
+    Enrich a user's analysis with the byte-weighted language shares.
+
+    Costs one API call per repository the first time; breakdowns are
+    cached per repository and pushed_at, so later runs only query
+    repositories that changed.
+    """
+    import pandas as pd
+
+    from api_client import get_repos_languages
+    from data_processing import get_language_bytes_stats
+
+    # Repositories never pushed to have no pushed_at; None keeps them out
+    # of the per-repository cache instead of caching them under "NaT".
+    repos = [
+        (full_name, pushed_at.isoformat() if pd.notna(pushed_at) else None)
+        for full_name, pushed_at in zip(_df_repos["full_name"], _df_repos["pushed_at"])
+    ]
+    return get_language_bytes_stats(get_repos_languages(repos))
+
+
+@st.cache_data(ttl=ANALYSIS_TTL, show_spinner=False)
+def load_trends(username: str, fetched_at: float):
+    """
+    Return the stored trend frames of a user: totals per snapshot and
+    repositories per language.
+
+    Cached per analysis (fetched_at), so reruns do not reopen the history;
+    a new fetch appends a snapshot and gets a new key.
+    """
+    from history import query_language_trends, query_trends
+
+    return query_trends(username), query_language_trends(username)
+
+
+def show_overview(account_type: str, user_profile: dict):
+    """
+    Render the profile section (avatar, bio, counters, links).
+    """
+    st.subheader(f"{account_type} overview")
+
+    col_avatar, col_info = st.columns([1, 3])
+
+    with col_avatar:
+        avatar_url = user_profile.get("avatar_url")
+        if avatar_url:
+            st.image(avatar_url, width=140)
+
+    with col_info:
+        st.markdown(f"**Name:** {user_profile.get('name') or '-'}")
+        st.markdown(f"**Username:** {user_profile.get('login') or '-'}")
+        bio = user_profile.get("bio") or user_profile.get("description")
+        st.markdown(f"**Bio:** {bio or '-'}")
+        st.markdown(f"**Location:** {user_profile.get('location') or '-'}")
+
+        st.markdown(
+            f"**Public repos:** {user_profile.get('public_repos', 0)}  |  "
+            f"**Followers:** {user_profile.get('followers', 0)}  |  "
+            f"**Following:** {user_profile.get('following', 0)}"
+        )
+
+        created_at = user_profile.get("created_at")
+        if created_at:
+            created_str = created_at.split("T")[0]
+            st.markdown(f"**Account created:** {created_str}")
+
+        profile_url = user_profile.get("html_url")
+        if profile_url:
+            st.markdown(f"[Open profile on GitHub]({profile_url})")
+
+    st.markdown("---")
+
+
+@st.fragment
+def show_repo_table(view, key: str):
+    """
+    Interactive repository table, sorted / filtered / paged on the server.
+
+    Only the visible page is sent to the browser, and interacting with the
+    controls reruns this fragment alone, so it stays as fast with 100k
+    repositories as with 100.
+    """
+    from table_view import PAGE_SIZES
+
+    col_query, col_language, col_sort, col_order = st.columns([3, 2, 2, 1])
+    with col_query:
+        query = st.text_input("Filter by name", key=f"{key}_query")
+    with col_language:
+        language = st.selectbox("Language", ["All"] + view.languages, key=f"{key}_language")
+    with col_sort:
+        sort_by = st.selectbox(
+            "Sort by",
+            ["stars", "forks", "pushed_at", "created_at", "name", "language"],
+            key=f"{key}_sort",
+        )
+    with col_order:
+        descending = st.toggle("Descending", value=True, key=f"{key}_descending")
+
+    filters = {
+        "sort_by": sort_by,
+        "descending": descending,
+        "query": query,
+        "language": None if language == "All" else language,
+    }
+    _, total = view.window(0, 0, **filters)
+
+    col_size, col_page, col_info = st.columns([1, 1, 3])
+    with col_size:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_size")
+
+    pages = max(1, -(-total // page_size))
+    # A narrower filter can leave the current page out of range
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    with col_page:
+        page = st.number_input("Page", min_value=1, max_value=pages, key=f"{key}_page")
+
+    offset = (page - 1) * page_size
+    rows, total = view.window(offset, page_size, **filters)
+
+    with col_info:
+        st.caption(
+            f"Showing {offset + 1 if total else 0}–{offset + len(rows)} "
+            f"of {total} repositories"
+        )
+    st.dataframe(rows, hide_index=True, use_container_width=True)
+
+
+def show_streaming_overview(slot, aggregator, expected: int, state: dict):
+    """
+    Redraw the partial repository overview while pages are arriving, at
+    most once every PROGRESS_INTERVAL seconds.
+    """
+    now = time.monotonic()
+    if now - state.get("drawn_at", 0.0) < PROGRESS_INTERVAL:
+        return
+    state["drawn_at"] = now
+
+    partial = aggregator.summary()
+    with slot.container():
+        st.progress(
+            min(partial.repo_count / max(expected, 1), 1.0),
+            text=f"Loaded {partial.repo_count} of {expected} repositories...",
+        )
+        st.markdown(
+            f"**Repositories:** {partial.repo_count}  |  "
+            f"**Stars:** {partial.total_stars}  |  "
+            f"**Forks:** {partial.total_forks}"
+        )
+        st.markdown("**Top repositories by stars so far**")
+        st.table(partial.top_stars[["name", "language", "stars", "forks", "html_url"]])
+
+
+def show_report_status(job_id: str, file_name: str):
+    """
+    Show a background PDF job: poll it while it is queued or running,
+    then offer the download (or the error) without polling any more.
+    """
+    from report_jobs import get_report_queue
+
+    job_queue = get_report_queue()
+    job = job_queue.status(job_id)
+
+    if job["status"] in ("queued", "running"):
+        poll_report_status(job_id)
+    elif job["status"] == "done":
+        st.download_button(
+            label="Download PDF report",
+            data=job_queue.result(job_id),
+            file_name=file_name,
+            mime="application/pdf",
+        )
+    elif job["status"] == "failed":
+        st.error(f"PDF generation failed: {job['error']}")
+    else:
+        st.info("This report is no longer available; please generate it again.")
+
+
+@st.fragment(run_every=1)
+def poll_report_status(job_id: str):
+    """
+    Show the progress of a PDF job, rerunning only this fragment each
+    second. Once the job has finished, the whole page is rerun once so that
+    show_report_status renders the result without this polling fragment.
+    """
+    from report_jobs import get_report_queue
+
+    job = get_report_queue().status(job_id)
+    if job["status"] not in ("queued", "running"):
+        st.rerun()
+    st.progress(job["progress"], text=f"Generating PDF ({job['status']})...")
+
+
+def show_comparison(comparison: dict):
+    """
+    Render a multi-user comparison: ranking, charts, activity and PDF.
+    """
+    from plots import comparison_stars_png, language_mix_png
+    from report_jobs import get_report_queue
+
+    summary = comparison["summary"]
+    table = summary.table
+
+    if comparison["missing"]:
+        st.warning("Users not found: " + ", ".join(comparison["missing"]))
+    if table.empty:
+        st.info("None of these users exist.")
+        return
+
+    # Both charts render in the background while the ranking is drawn
+    chart_executor = get_chart_executor()
+    stars_chart = chart_executor.submit(comparison_stars_png, table.head(COMPARISON_CHART_USERS))
+    mix_chart = chart_executor.submit(
+        language_mix_png, summary.language_mix.head(COMPARISON_CHART_USERS)
+    )
+
+    # ---------------------------------------------------------------------
+    # Section 1 – Ranking
+    # ---------------------------------------------------------------------
+    st.subheader(f"Ranking of {len(table)} users")
+    st.caption("Ranked by total stars, then forks, then most recent push.")
+    st.dataframe(
+        table,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "avg_stars": st.column_config.NumberColumn(format="%.1f"),
+            "last_pushed_at": st.column_config.DatetimeColumn(format="YYYY-MM-DD"),
+        },
+    )
+    st.markdown("---")
+
+    # ---------------------------------------------------------------------
+    # Section 2 – Stars and language mix
+    # ---------------------------------------------------------------------
+    st.subheader("Stars and language mix")
+    col_stars, col_mix = st.columns(2)
+    with col_stars:
+        stars_slot = st.empty()
+    with col_mix:
+        mix_slot = st.empty()
+    st.markdown("---")
+
+    # ---------------------------------------------------------------------
+    # Section 3 – Activity
+    # ---------------------------------------------------------------------
+    st.subheader("Repositories created per year")
+    top_activity = summary.activity.head(COMPARISON_CHART_USERS)
+    st.line_chart(top_activity.T.rename(index=str))
+    st.markdown("---")
+
+    # ---------------------------------------------------------------------
+    # Section 4 – PDF report
+    # ---------------------------------------------------------------------
+    st.subheader("PDF report")
+
+    if st.button("Generate comparison PDF"):
+        st.session_state["comparison_job"] = get_report_queue().submit_comparison(
+            comparison_table=table,
+            activity_df=summary.activity,
+            stars_chart_png=stars_chart.result(),
+            language_mix_png=mix_chart.result(),
+        )
+
+    comparison_job = st.session_state.get("comparison_job")
+    if comparison_job:
+        show_report_status(comparison_job, "github_profile_comparison.pdf")
+
+    with tracing.stage("main.charts"):
+        stars_slot.image(stars_chart.result(), use_container_width=True)
+        mix_slot.image(mix_chart.result(), use_container_width=True)
+
+
+def show_diagnostics():
+    """
+    Show the metrics recorded by the tracing layer since the last reset,
+    with JSON lines / Prometheus downloads.
+    """
+    import pandas as pd
+
+    from analysis_cache import get_analysis_cache
+    from api_client import get_rate_limit_status
+    from plots import CHART_CACHE_BYTES, chart_cache_entries
+
+    metrics = tracing.snapshot()
+
+    with st.expander("Diagnostics", expanded=True):
+        if not tracing.is_enabled():
+            st.info(
+                "Tracing is disabled on this server: start it with "
+                "GITHUB_ANALYZER_TRACE=1 to record stages and API calls."
+            )
+
+        col_stages, col_counters = st.columns(2)
+
+        with col_stages:
+            st.markdown("**Stage durations**")
+            if metrics["stages"]:
+                st.dataframe(pd.DataFrame(metrics["stages"]), use_container_width=True)
+            else:
+                st.info("Nothing recorded yet; run an analysis.")
+
+        with col_counters:
+            st.markdown("**HTTP & cache counters**")
+            counters = pd.DataFrame(metrics["counters"] + metrics["gauges"])
+            if not counters.empty:
+                counters["labels"] = counters["labels"].map(
+                    lambda labels: ", ".join(f"{k}={v}" for k, v in labels.items())
+                )
+                st.dataframe(counters, use_container_width=True)
+
+            for cache, ratio in metrics["cache_hit_ratios"].items():
+                st.markdown(f"**Cache hit ratio ({cache}):** {ratio:.0%}")
+
+            st.markdown("**Rate limit budget**")
+            st.dataframe(pd.DataFrame(get_rate_limit_status()), use_container_width=True)
+
+        # Shared by every session of this process, whether tracing is on or not
+        analysis_cache = get_analysis_cache()
+        cache_stats = analysis_cache.stats()
+        charts = chart_cache_entries()
+        chart_bytes = sum(chart["bytes"] for chart in charts)
+
+        st.markdown("**Memory (shared caches)**")
+        st.markdown(
+            f"Analyses: {cache_stats['entries']} entries, "
+            f"{cache_stats['bytes'] / 2**20:.1f} of {cache_stats['max_bytes'] / 2**20:.0f} MiB, "
+            f"{cache_stats['evictions']} evicted  |  "
+            f"Charts: {len(charts)} PNGs, "
+            f"{chart_bytes / 2**20:.1f} of {CHART_CACHE_BYTES / 2**20:.0f} MiB"
+        )
+        entries = pd.DataFrame(analysis_cache.entries(), columns=["key", "bytes", "age_s", "hits"])
+        if not entries.empty:
+            entries["key"] = entries["key"].map(lambda key: " / ".join(map(str, key)))
+            entries["MiB"] = entries.pop("bytes") / 2**20
+            st.dataframe(entries, hide_index=True, use_container_width=True)
+
+        col_jsonl, col_prom, col_reset = st.columns(3)
+        with col_jsonl:
+            st.download_button(
+                "Export JSON lines",
+                data=tracing.to_json_lines(),
+                file_name="metrics.jsonl",
+                mime="application/x-ndjson",
+            )
+        with col_prom:
+            st.download_button(
+                "Export Prometheus text",
+                data=tracing.to_prometheus(),
+                file_name="metrics.prom",
+                mime="text/plain",
+            )
+        with col_reset:
+            if st.button("Reset metrics"):
+                tracing.reset()
+                st.rerun()
+
+
 st.title("GitHub Profile Analyzer – PRO")
 st.write(
     "Analyze any public GitHub profile and generate a data-driven overview for "
@@ -26,8 +558,28 @@ st.write(
 
 with st.sidebar:
     st.header("Settings")
-    username = st.text_input("GitHub username", value="torvalds")
-    analyze_button = st.button("Analyze profile")
+    account_type = st.radio(
+        "Account type", ["User", "Organization", "Comparison"], horizontal=True
+    )
+    if account_type == "Comparison":
+        username = st.text_area(
+            "GitHub usernames",
+            help=f"Separated by commas, spaces or new lines (up to {MAX_COMPARISON_USERS}).",
+        )
+        analyze_button = st.button("Compare profiles")
+    else:
+        username = st.text_input("GitHub username or organization", value="torvalds")
+        analyze_button = st.button("Analyze profile")
+    byte_languages = st.checkbox(
+        "Byte-weighted languages",
+        help="Weights languages by bytes of code. Costs one extra API call "
+        "per repository the first time (users only).",
+    )
+    diagnostics = st.checkbox(
+        "Diagnostics",
+        help="Show stage timings, API calls and cache hit ratios. Collection is "
+        "process-wide and set by the server (GITHUB_ANALYZER_TRACE=1).",
+    )
 
 # -----------------------------------------------------------------------------
 # Validation
@@ -35,85 +587,126 @@ with st.sidebar:
 if analyze_button and not username.strip():
     st.error("Please enter a valid GitHub username.")
 
+# The analyzed account is kept in the session so that follow-up reruns
+# (e.g. the PDF button) keep showing the same analysis.
+if analyze_button and account_type == "Comparison":
+    usernames = parse_usernames(username)
+    if len(usernames) > MAX_COMPARISON_USERS:
+        st.error(f"Please compare at most {MAX_COMPARISON_USERS} users at once.")
+    elif usernames:
+        set_analyzed((account_type, ",".join(usernames)))
+elif analyze_button and username.strip():
+    set_analyzed((account_type, username.strip()))
+
 # -----------------------------------------------------------------------------
 # Main analysis
 # -----------------------------------------------------------------------------
-if analyze_button and username.strip():
-    username = username.strip()
+analyzed = st.session_state.get("analyzed")
 
+if analyzed and analyzed[0] == "Comparison":
     try:
-        user_profile = get_user_profile(username)
-        repos_json = get_user_repos(username)
-    except ValueError as e:
-        st.error(str(e))
+        with st.spinner("Fetching profiles and repositories..."), tracing.stage("main.load_comparison"):
+            comparison = load_comparison(analyzed[1].split(","))
     except Exception as e:
         st.error(f"Unexpected error while calling GitHub API: {e}")
     else:
-        df_repos = build_repos_dataframe(repos_json)
-
-        # ---------------------------------------------------------------------
-        # Section 1 – User overview
-        # ---------------------------------------------------------------------
-        st.subheader("User overview")
-
-        col_avatar, col_info = st.columns([1, 3])
+        show_comparison(comparison)
 
-        with col_avatar:
-            avatar_url = user_profile.get("avatar_url")
-            if avatar_url:
-                st.image(avatar_url, width=140)
+elif analyzed:
+    import pyarrow as pa
 
-        with col_info:
-            st.markdown(f"**Name:** {user_profile.get('name') or '-'}")
-            st.markdown(f"**Username:** {user_profile.get('login') or '-'}")
-            st.markdown(f"**Bio:** {user_profile.get('bio') or '-'}")
-            st.markdown(f"**Location:** {user_profile.get('location') or '-'}")
+    from plots import language_bytes_png, language_distribution_png, repos_by_year_png
+    from report_jobs import get_report_queue
 
-            st.markdown(
-                f"**Public repos:** {user_profile.get('public_repos', 0)}  |  "
-                f"**Followers:** {user_profile.get('followers', 0)}  |  "
-                f"**Following:** {user_profile.get('following', 0)}"
-            )
-
-            created_at = user_profile.get("created_at")
-            if created_at:
-                created_str = created_at.split("T")[0]
-                st.markdown(f"**Account created:** {created_str}")
+    account_type, username = analyzed
 
-            profile_url = user_profile.get("html_url")
-            if profile_url:
-                st.markdown(f"[Open profile on GitHub]({profile_url})")
+    try:
+        analysis = cached_analysis(account_type, username)
+        user_profile = analysis["user_profile"] if analysis else load_profile(account_type, username)
 
-        st.markdown("---")
+        # ---------------------------------------------------------------------
+        # Section 1 – User / organization overview
+        # ---------------------------------------------------------------------
+        show_overview(account_type, user_profile)
 
         # ---------------------------------------------------------------------
-        # Section 2 – Repositories overview
+        # Section 2 – Repositories overview (streamed while pages arrive)
         # ---------------------------------------------------------------------
         st.subheader("Repositories overview")
 
-        if df_repos.empty:
-            st.info("This user has no public repositories.")
+        if analysis is None:
+            expected = user_profile.get("public_repos") or 0
+            progress_slot = st.empty()
+            progress_state = {}
+            with tracing.stage("main.load_analysis"):
+                analysis = stream_analysis(
+                    account_type,
+                    username,
+                    user_profile,
+                    lambda aggregator: show_streaming_overview(
+                        progress_slot,
+                        aggregator,
+                        expected,
+                        progress_state,
+                    ),
+                )
+            progress_slot.empty()
+
+            # The profile counter and the listing can briefly disagree while
+            # repositories are created or deleted, but a gap is worth showing.
+            if analysis["summary"].repo_count != expected:
+                st.warning(
+                    f"The profile reports {expected} public repositories, "
+                    f"but {analysis['summary'].repo_count} were loaded."
+                )
+    except ValueError as e:
+        st.error(str(e))
+    except Exception as e:
+        st.error(f"Unexpected error while calling GitHub API: {e}")
+    else:
+        df_repos = analysis["df_repos"]
+        summary = analysis["summary"]
+
+        # Charts are rendered in the background while the tables are drawn,
+        # and put in place last. They are cached per distinct input and
+        # shared with the PDF.
+        chart_executor = get_chart_executor()
+        lang_chart = chart_executor.submit(language_distribution_png, summary.lang_stats)
+        activity_chart = chart_executor.submit(repos_by_year_png, summary.activity)
+        chart_slots = []
+
+        def chart_slot(chart):
+            slot = st.empty()
+            slot.caption("Rendering chart...")
+            chart_slots.append((slot, chart))
+
+        if summary.repo_count == 0:
+            st.info(f"This {account_type.lower()} has no public repositories.")
         else:
-            st.markdown("**Repository table (sorted by stars)**")
-            st.dataframe(
-                df_repos[
-                    ["name", "language", "stars", "forks", "created_at", "pushed_at"]
-                ].sort_values("stars", ascending=False),
-                use_container_width=True,
-            )
+            # Organizations are aggregated page by page; there is no
+            # full repository frame to show.
+            if df_repos is not None:
+                st.markdown("**Repository table**")
+                show_repo_table(analysis["table_view"], key=f"repos_{username.lower()}")
+            else:
+                st.markdown(
+                    f"**Repositories:** {summary.repo_count}  |  "
+                    f"**Stars:** {summary.total_stars}  |  "
+                    f"**Forks:** {summary.total_forks}"
+                )
 
             col_top_stars, col_recent = st.columns(2)
 
             with col_top_stars:
                 st.markdown("**Top repositories by stars**")
-                top_stars_df = get_top_repos_by_stars(df_repos, n=5)
+                top_stars_df = summary.top_stars
                 st.table(
                     top_stars_df[["name", "language", "stars", "forks", "html_url"]]
                 )
 
             with col_recent:
                 st.markdown("**Recently updated repositories**")
-                top_recent_df = get_top_recent_repos(df_repos, n=5)
+                top_recent_df = summary.top_recent
                 st.table(
                     top_recent_df[["name", "language", "pushed_at", "html_url"]]
                 )
@@ -125,7 +718,7 @@ if analyze_button and username.strip():
         # ---------------------------------------------------------------------
         st.subheader("Language analysis")
 
-        lang_stats_df = get_language_stats(df_repos)
+        lang_stats_df = summary.lang_stats
 
         col_lang_table, col_lang_plot = st.columns([1, 2])
 
@@ -134,8 +727,29 @@ if analyze_button and username.strip():
             st.table(lang_stats_df)
 
         with col_lang_plot:
-            fig_lang = plot_language_distribution(lang_stats_df)
-            st.pyplot(fig_lang, use_container_width=True)
+            chart_slot(lang_chart)
+
+        lang_bytes_df = None
+        lang_bytes_chart = None
+
+        if byte_languages and df_repos is not None:
+            try:
+                lang_bytes_df = load_language_bytes(username, df_repos)
+            except Exception as e:
+                st.error(f"Unexpected error while fetching language breakdowns: {e}")
+            else:
+                lang_bytes_chart = chart_executor.submit(language_bytes_png, lang_bytes_df)
+
+                col_bytes_table, col_bytes_plot = st.columns([1, 2])
+
+                with col_bytes_table:
+                    st.markdown("**Share of code per language (bytes)**")
+                    st.table(lang_bytes_df)
+
+                with col_bytes_plot:
+                    chart_slot(lang_bytes_chart)
+        elif byte_languages:
+            st.info("Byte-weighted languages are only available for users.")
 
         st.markdown("---")
 
@@ -144,7 +758,7 @@ if analyze_button and username.strip():
         # ---------------------------------------------------------------------
         st.subheader("Activity metrics")
 
-        activity_df = get_activity_by_year(df_repos)
+        activity_df = summary.activity
 
         col_activity_table, col_activity_plot = st.columns([1, 2])
 
@@ -153,33 +767,73 @@ if analyze_button and username.strip():
             st.table(activity_df)
 
         with col_activity_plot:
-            fig_activity = plot_repos_by_year(activity_df)
-            st.pyplot(fig_activity, use_container_width=True)
+            chart_slot(activity_chart)
 
         st.markdown("---")
 
         # ---------------------------------------------------------------------
-        # Section 5 – PDF report
+        # Section 5 – Trends over time
+        # ---------------------------------------------------------------------
+        if df_repos is not None:
+            st.subheader("Trends over time")
+
+            # Files written by an interrupted older version can be unreadable;
+            # that only costs the trends, never the analysis.
+            try:
+                trends_df, lang_trends_df = load_trends(username, analysis["fetched_at"])
+            except (pa.ArrowInvalid, OSError) as e:
+                st.warning(f"Trend history of {username} could not be read: {e}")
+            else:
+                if len(trends_df) < 2:
+                    st.info(
+                        "Trends appear once this profile has been analyzed more than once."
+                    )
+                else:
+                    col_trend_totals, col_trend_langs = st.columns(2)
+
+                    with col_trend_totals:
+                        st.markdown("**Stars, forks and repositories**")
+                        st.line_chart(
+                            trends_df.set_index("snapshot_at")[
+                                ["total_stars", "total_forks", "repo_count"]
+                            ]
+                        )
+
+                    with col_trend_langs:
+                        st.markdown("**Repositories per language**")
+                        st.area_chart(lang_trends_df)
+
+            st.markdown("---")
+
+        # ---------------------------------------------------------------------
+        # Section 6 – PDF report
         # ---------------------------------------------------------------------
         st.subheader("PDF report")
 
         if st.button("Generate PDF report"):
-            with st.spinner("Generating PDF..."):
-                pdf_path = generate_pdf_report(
-                    username=username,
-                    user_profile=user_profile,
-                    df_repos=df_repos,
-                    lang_stats_df=lang_stats_df,
-                    activity_df=activity_df,
-                    fig_lang=fig_lang,
-                    fig_activity=fig_activity,
-                    output_path=f"github_profile_report_{username}.pdf",
-                )
+            st.session_state["report_job"] = get_report_queue().submit(
+                username=username,
+                user_profile=user_profile,
+                df_repos=df_repos,
+                lang_stats_df=lang_stats_df,
+                activity_df=activity_df,
+                lang_chart_png=lang_chart.result(),
+                activity_chart_png=activity_chart.result(),
+                lang_bytes_df=lang_bytes_df,
+                lang_bytes_png=lang_bytes_chart.result() if lang_bytes_chart else None,
+            )
 
-            with open(pdf_path, "rb") as f:
-                st.download_button(
-                    label="Download PDF report",
-                    data=f,
-                    file_name=f"github_profile_report_{username}.pdf",
-                    mime="application/pdf",
-                )
+        report_job = st.session_state.get("report_job")
+        if report_job:
+            show_report_status(report_job, f"github_profile_report_{username}.pdf")
+
+        # Charts last: wait for the background renders and put them in place
+        with tracing.stage("main.charts"):
+            for slot, chart in chart_slots:
+                slot.image(chart.result(), use_container_width=True)
+
+# -----------------------------------------------------------------------------
+# Diagnostics
+# -----------------------------------------------------------------------------
+if diagnostics:
+    show_diagnostics()
@@ -0,0 +1,405 @@
+"""
+Local stand-in for api.github.com serving synthetic payloads.
+
+Usage:
+    python app/mock_github.py --port 8765 --user alice=250 --user bob=12000
+
+Serves /users/{username}, /users/{username}/repos (with Link pagination,
+ETag / If-None-Match and rate limit headers) and
+/repos/{owner}/{repo}/languages for the configured users, plus POST
+/graphql answering the aliased user(login:) queries of
+api_client.get_users_bulk with cursor pagination. Point
+api_client.BASE_URL at the printed URL (and api_client.GRAPHQL_URL at
+<url>/graphql) to run the pipeline offline.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+
+LANGUAGES = [
+    "Python", "JavaScript", "TypeScript", "Go", "Rust", "C", "C++", "Java",
+    "Shell", "Ruby", "Jupyter Notebook", "HTML", None,
+]
+LANGUAGE_WEIGHTS = [18, 14, 10, 8, 6, 7, 6, 8, 5, 4, 5, 4, 5]
+
+# One aliased user sub-query, e.g. `u0: user(login: $login0) {`
+GRAPHQL_USER_ALIAS = re.compile(r"(\w+)\s*:\s*user\(\s*login\s*:\s*\$(\w+)\s*\)")
+GRAPHQL_FIRST = re.compile(r"first\s*:\s*(\d+)")
+GRAPHQL_AFTER = re.compile(r"after\s*:\s*\$(\w+)")
+
+
+def make_profile(username: str, n_repos: int) -> dict:
+    """
+    Return a synthetic /users/{username} payload.
+    """
+    return {
+        "login": username,
+        "id": int(hashlib.sha256(username.encode()).hexdigest()[:8], 16),
+        "avatar_url": f"https://avatars.githubusercontent.com/u/{username}",
+        "html_url": f"https://github.com/{username}",
+        "type": "User",
+        "name": username.title(),
+        "company": None,
+        "blog": "",
+        "location": "Earth",
+        "bio": f"Synthetic profile with {n_repos} repositories.",
+        "public_repos": n_repos,
+        "followers": n_repos * 3,
+        "following": 7,
+        "created_at": "2012-04-01T09:30:00Z",
+        "updated_at": "2025-01-01T00:00:00Z",
+    }
+
+
+def make_repos(username: str, n_repos: int, seed: int = 0) -> list[dict]:
+    """
+    Return `n_repos` synthetic repositories shaped like the GitHub REST
+    API output (including the nested owner / license / permissions
+    objects and the many *_url fields), sorted by updated_at descending.
+    """
+    rng = random.Random(f"{username}:{seed}")
+    owner = {
+        "login": username,
+        "id": 1,
+        "node_id": "MDQ6VXNlcjE=",
+        "avatar_url": f"https://avatars.githubusercontent.com/u/{username}",
+        "url": f"https://api.github.com/users/{username}",
+        "html_url": f"https://github.com/{username}",
+        "type": "User",
+        "site_admin": False,
+    }
+    for name in ("followers", "following", "gists", "starred", "subscriptions",
+                 "organizations", "repos", "events", "received_events"):
+        owner[f"{name}_url"] = f"https://api.github.com/users/{username}/{name}"
+
+    repos = []
+    for i in range(n_repos):
+        name = f"repo-{i:06d}"
+        full_name = f"{username}/{name}"
+        api_url = f"https://api.github.com/repos/{full_name}"
+        created = (
+            f"{rng.randint(2010, 2024)}-{rng.randint(1, 12):02d}-"
+            f"{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00Z"
+        )
+        pushed = (
+            f"{rng.randint(2020, 2025)}-{rng.randint(1, 12):02d}-"
+            f"{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00Z"
+        )
+        repo = {
+            "id": i,
+            "node_id": f"R_{i:010d}",
+            "name": name,
+            "full_name": full_name,
+            "private": False,
+            "owner": owner,
+            "html_url": f"https://github.com/{full_name}",
+            "description": f"Synthetic repository number {i}" if rng.random() > 0.2 else None,
+            "fork": rng.random() < 0.15,
+            "url": api_url,
+            "homepage": None,
+            "size": rng.randint(10, 500_000),
+            "stargazers_count": int(rng.paretovariate(1.2)) - 1,
+            "watchers_count": 0,
+            "language": rng.choices(LANGUAGES, LANGUAGE_WEIGHTS)[0],
+            "forks_count": int(rng.paretovariate(1.5)) - 1,
+            "open_issues_count": rng.randint(0, 40),
+            "license": {
+                "key": "mit",
+                "name": "MIT License",
+                "spdx_id": "MIT",
+                "url": "https://api.github.com/licenses/mit",
+                "node_id": "MDc6TGljZW5zZTEz",
+            },
+            "topics": ["synthetic", "benchmark"],
+            "default_branch": "main",
+            "created_at": created,
+            "updated_at": pushed,
+            "pushed_at": pushed,
+            "permissions": {"admin": False, "maintain": False, "push": False,
+                            "triage": False, "pull": True},
+        }
+        for name_ in ("forks", "keys", "collaborators", "teams", "hooks", "issue_events",
+                      "events", "assignees", "branches", "tags", "blobs", "git_tags",
+                      "git_refs", "trees", "statuses", "languages", "stargazers",
+                      "contributors", "subscribers", "subscription", "commits",
+                      "git_commits", "comments", "issue_comment", "contents", "compare",
+                      "merges", "archive", "downloads", "issues", "pulls", "milestones",
+                      "notifications", "labels", "releases", "deployments"):
+            repo[f"{name_}_url"] = f"{api_url}/{name_}"
+        repo["watchers_count"] = repo["stargazers_count"]
+        repos.append(repo)
+
+    repos.sort(key=lambda r: r["updated_at"], reverse=True)
+    return repos
+
+
+def graphql_repo(repo: dict) -> dict:
+    """
+    Convert a synthetic REST repository to a GraphQL repository node.
+    """
+    return {
+        "name": repo["name"],
+        "nameWithOwner": repo["full_name"],
+        "description": repo["description"],
+        "url": repo["html_url"],
+        "stargazerCount": repo["stargazers_count"],
+        "forkCount": repo["forks_count"],
+        "createdAt": repo["created_at"],
+        "pushedAt": repo["pushed_at"],
+        "updatedAt": repo["updated_at"],
+        "primaryLanguage": {"name": repo["language"]} if repo["language"] else None,
+    }
+
+
+def make_languages(full_name: str) -> dict:
+    """
+    Return a deterministic synthetic /repos/{full_name}/languages payload.
+    """
+    rng = random.Random(full_name)
+    picked = rng.sample([lang for lang in LANGUAGES if lang], k=rng.randint(1, 4))
+    return {lang: rng.randint(100, 2_000_000) for lang in picked}
+
+
+class MockGitHubServer:
+    """
+    Threaded HTTP server imitating the parts of api.github.com the
+    analyzer uses. `users` maps usernames to their number of repositories;
+    `latency` adds a fixed delay (seconds) to every response.
+    """
+
+    def __init__(self, users: dict[str, int], host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, rate_limit: int = 5000):
+        self.users = {name.lower(): n for name, n in users.items()}
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.request_count = 0
+
+        self._repos: dict[str, list[dict]] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockGitHubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockGitHubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def add_user(self, username: str, n_repos: int) -> None:
+        """
+        Add (or resize) a synthetic user and generate its repositories now,
+        so the first request does not pay for it.
+        """
+        username = username.lower()
+        with self._lock:
+            self.users[username] = n_repos
+            self._repos[username] = make_repos(username, n_repos)
+
+    def repos(self, username: str) -> list[dict]:
+        with self._lock:
+            if username not in self._repos:
+                self._repos[username] = make_repos(username, self.users[username])
+            return self._repos[username]
+
+    def _route(self, path: str, query: dict) -> tuple[int, object, dict]:
+        parts = [p for p in path.split("/") if p]
+
+        if len(parts) == 2 and parts[0] == "users" and parts[1].lower() in self.users:
+            username = parts[1].lower()
+            return 200, make_profile(username, self.users[username]), {}
+
+        if (len(parts) == 3 and parts[0] == "users" and parts[2] == "repos"
+                and parts[1].lower() in self.users):
+            repos = self.repos(parts[1].lower())
+            per_page = min(int(query.get("per_page", ["30"])[0]), 100)
+            page = int(query.get("page", ["1"])[0])
+            last = max(1, -(-len(repos) // per_page))
+
+            headers = {}
+            if page < last:
+                base = f"{self.url}{path}?per_page={per_page}"
+                headers["Link"] = (
+                    f'<{base}&page={page + 1}>; rel="next", <{base}&page={last}>; rel="last"'
+                )
+            return 200, repos[(page - 1) * per_page: page * per_page], headers
+
+        if len(parts) == 4 and parts[0] == "repos" and parts[3] == "languages":
+            if parts[1].lower() in self.users:
+                return 200, make_languages(f"{parts[1]}/{parts[2]}"), {}
+
+        return 404, {"message": "Not Found"}, {}
+
+    def _graphql(self, query: str, variables: dict) -> dict:
+        """
+        Answer a query made of aliased `user(login: $var)` sub-queries, each
+        selecting profile fields (optional) and a `repositories(first:,
+        after:)` connection. Cursors are plain offsets. Unknown users come
+        back as null with a NOT_FOUND error, as on GitHub.
+        """
+        aliases = list(GRAPHQL_USER_ALIAS.finditer(query))
+        data, errors = {}, []
+
+        for i, match in enumerate(aliases):
+            alias, login_var = match.groups()
+            end = aliases[i + 1].start() if i + 1 < len(aliases) else len(query)
+            selection = query[match.end():end]
+            login = variables.get(login_var) or ""
+
+            if login.lower() not in self.users:
+                data[alias] = None
+                errors.append(
+                    {
+                        "type": "NOT_FOUND",
+                        "path": [alias],
+                        "message": f"Could not resolve to a User with the login of '{login}'.",
+                    }
+                )
+                continue
+
+            repos = self.repos(login.lower())
+            first = GRAPHQL_FIRST.search(selection)
+            after = GRAPHQL_AFTER.search(selection)
+            per_page = min(int(first.group(1)), 100) if first else 100
+            offset = int((after and variables.get(after.group(1))) or 0)
+            page = repos[offset: offset + per_page]
+
+            node = {
+                "repositories": {
+                    "totalCount": len(repos),
+                    "pageInfo": {
+                        "hasNextPage": offset + per_page < len(repos),
+                        "endCursor": str(offset + len(page)) if page else None,
+                    },
+                    "nodes": [graphql_repo(repo) for repo in page],
+                }
+            }
+            if "followers" in selection.split("repositories", 1)[0]:
+                profile = make_profile(login.lower(), self.users[login.lower()])
+                node.update(
+                    {
+                        "login": profile["login"],
+                        "name": profile["name"],
+                        "bio": profile["bio"],
+                        "location": profile["location"],
+                        "avatarUrl": profile["avatar_url"],
+                        "url": profile["html_url"],
+                        "createdAt": profile["created_at"],
+                        "followers": {"totalCount": profile["followers"]},
+                        "following": {"totalCount": profile["following"]},
+                    }
+                )
+            data[alias] = node
+
+        payload = {"data": data}
+        if errors:
+            payload["errors"] = errors
+        return payload
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                status, payload, headers = server._route(parsed.path, parse_qs(parsed.query))
+                self._respond(status, payload, headers)
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                if urlparse(self.path).path != "/graphql":
+                    self._respond(404, {"message": "Not Found"}, {})
+                    return
+                payload = server._graphql(request.get("query", ""), request.get("variables") or {})
+                self._respond(200, payload, {})
+
+            def _respond(self, status: int, payload: object, headers: dict) -> None:
+                if server.latency:
+                    time.sleep(server.latency)
+
+                with server._lock:
+                    server.request_count += 1
+                    remaining = max(server.rate_limit - server.request_count, 0)
+
+                body = json.dumps(payload).encode()
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+
+                headers.update(
+                    {
+                        "Content-Type": "application/json; charset=utf-8",
+                        "ETag": etag,
+                        "X-RateLimit-Limit": str(server.rate_limit),
+                        "X-RateLimit-Remaining": str(remaining),
+                        "X-RateLimit-Reset": str(int(time.time()) + 3600),
+                    }
+                )
+
+                if (self.command == "GET" and status == 200
+                        and self.headers.get("If-None-Match") == etag):
+                    status, body = 304, b""
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in for api.github.com.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--user", action="append", default=[], metavar="NAME=REPOS",
+        help="Synthetic user and its number of repositories (repeatable)",
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay per response (s)")
+    args = parser.parse_args(argv)
+
+    users = dict(item.split("=", 1) for item in args.user) or {"octocat": "250"}
+    server = MockGitHubServer(
+        {name: int(n) for name, n in users.items()},
+        host=args.host, port=args.port, latency=args.latency,
+    )
+    print(f"Mock GitHub API listening on {server.url} for users: {', '.join(users)}")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,106 @@
-from typing import Optional
+import hashlib
+import os
+import threading
+from io import BytesIO
+from typing import TYPE_CHECKING, Optional
 
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+from cachetools import LRUCache, cached
 
+import tracing
 
-def plot_language_distribution(lang_stats: pd.DataFrame):
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+# Charts are only ever rasterized to PNG; never pick an interactive backend.
+# Set before matplotlib itself is (lazily) imported in _new_figure().
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+
+# Resolution of the rendered PNG charts (shared by dashboard and PDF)
+CHART_DPI = 120
+
+# Memory budget of the rendered PNG charts, shared by all sessions
+CHART_CACHE_BYTES = 32 * 1024 * 1024
+
+# Rendered charts kept in memory, keyed by chart kind + input content hash,
+# least recently used first out once their PNGs exceed the budget
+_chart_cache = LRUCache(maxsize=CHART_CACHE_BYTES, getsizeof=len)
+_chart_cache_lock = threading.Lock()
+
+
+def _new_figure() -> "Figure":
+    """
+    Create a standalone Figure (Agg canvas, no pyplot global registry),
+    so it is garbage-collected as soon as it is no longer referenced.
+
+    matplotlib is imported on the first chart drawn rather than with this
+    module, which keeps it out of the dashboard's cold start.
+    """
+    from matplotlib.figure import Figure
+
+    return Figure(figsize=(6.4, 4.8))
+
+
+def _chart_key(kind: str, index: bool = False):
+    """
+    Build the cache key function of a chart, counting lookups for the
+    cache hit ratio (misses are counted in the rendering functions).
+    Set index=True for charts that label their data with the index.
+    """
+
+    def key(df: pd.DataFrame) -> tuple:
+        tracing.count("cache_lookups_total", cache="charts")
+        return kind, frame_hash(df, index=index)
+
+    return key
+
+
+def chart_cache_entries() -> list[dict]:
+    """
+    Return the kind and PNG size in bytes of every cached chart.
+    """
+    with _chart_cache_lock:
+        return [
+            {"chart": kind, "bytes": len(png)}
+            for (kind, _), png in _chart_cache.items()
+        ]
+
+
+def frame_hash(df: pd.DataFrame, index: bool = False) -> str:
+    """
+    Return a content hash of a DataFrame (values and column names, plus
+    the index when index=True).
+    """
+    digest = hashlib.sha256(",".join(map(str, df.columns)).encode())
+    # hash_pandas_object fails on rows without columns (e.g. the activity
+    # of users who have no repositories); there are no values to hash then.
+    if len(df.columns) or not len(df):
+        digest.update(pd.util.hash_pandas_object(df, index=index).to_numpy().tobytes())
+    elif index:
+        digest.update(pd.util.hash_pandas_object(df.index).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+@tracing.traced("plots.render_png")
+def render_png(fig: "Figure", dpi: int = CHART_DPI) -> bytes:
+    """
+    Rasterize a Figure to PNG bytes.
+    """
+    buffer = BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+@tracing.traced("plots.plot_language_distribution")
+def plot_language_distribution(lang_stats: pd.DataFrame) -> "Figure":
     """
     Create a bar chart with the number of repositories per language.
     Returns a matplotlib Figure.
     """
-    fig, ax = plt.subplots()
+    fig = _new_figure()
+    ax = fig.subplots()
 
     if lang_stats.empty:
         ax.text(0.5, 0.5, "No repositories found", ha="center", va="center")
@@ -26,12 +117,14 @@ def plot_language_distribution(lang_stats: pd.DataFrame):
     return fig
 
 
-def plot_repos_by_year(activity_df: pd.DataFrame):
+@tracing.traced("plots.plot_repos_by_year")
+def plot_repos_by_year(activity_df: pd.DataFrame) -> "Figure":
     """
     Create a simple line chart with repositories created per year.
     Returns a matplotlib Figure.
     """
-    fig, ax = plt.subplots()
+    fig = _new_figure()
+    ax = fig.subplots()
 
     if activity_df.empty:
         ax.text(0.5, 0.5, "No repositories found", ha="center", va="center")
@@ -47,6 +140,163 @@ def plot_repos_by_year(activity_df: pd.DataFrame):
     return fig
 
 
+@tracing.traced("plots.plot_language_bytes")
+def plot_language_bytes(lang_bytes: pd.DataFrame, top: int = 10) -> "Figure":
+    """
+    Create a horizontal bar chart with each language's share of the code
+    (by bytes) across all repositories. Returns a matplotlib Figure.
+    """
+    fig = _new_figure()
+    ax = fig.subplots()
+
+    if lang_bytes.empty:
+        ax.text(0.5, 0.5, "No language data found", ha="center", va="center")
+        ax.axis("off")
+        return fig
+
+    shown = lang_bytes.head(top).iloc[::-1]
+    ax.barh(shown["language"], shown["share"] * 100)
+    ax.set_xlabel("Share of code (%)")
+    ax.set_title("Language share by bytes of code")
+    fig.tight_layout()
+
+    return fig
+
+
+@tracing.traced("plots.plot_comparison_stars")
+def plot_comparison_stars(table: pd.DataFrame, top: int = 20) -> "Figure":
+    """
+    Create a horizontal bar chart with the total stars of the `top`
+    ranked users of a comparison (see compare_users).
+    Returns a matplotlib Figure.
+    """
+    fig = _new_figure()
+    ax = fig.subplots()
+
+    if table.empty:
+        ax.text(0.5, 0.5, "No users to compare", ha="center", va="center")
+        ax.axis("off")
+        return fig
+
+    shown = table.head(top).iloc[::-1]
+    ax.barh(shown["user"].astype(str), shown["total_stars"])
+    ax.set_xlabel("Total stars")
+    ax.set_title(f"Top {len(shown)} users by stars")
+    fig.tight_layout()
+
+    return fig
+
+
+@tracing.traced("plots.plot_language_mix")
+def plot_language_mix(
+    language_mix: pd.DataFrame, top: int = 20, top_languages: int = 8
+) -> "Figure":
+    """
+    Create a stacked horizontal bar chart with the language shares of the
+    first `top` users of a comparison (one row per user, in the given
+    order). Languages outside the `top_languages` most used overall are
+    grouped as "Other". Returns a matplotlib Figure.
+    """
+    fig = _new_figure()
+    ax = fig.subplots()
+
+    if language_mix.empty or language_mix.columns.empty:
+        ax.text(0.5, 0.5, "No language data found", ha="center", va="center")
+        ax.axis("off")
+        return fig
+
+    shown = language_mix.head(top).iloc[::-1]
+    languages = shown.sum().sort_values(ascending=False).index[:top_languages]
+    shares = shown[languages]
+    other = shown.drop(columns=languages).sum(axis=1)
+    if other.any():
+        shares = shares.assign(Other=other)
+
+    left = np.zeros(len(shares))
+    labels = shares.index.astype(str)
+    for language in shares.columns:
+        values = shares[language].to_numpy() * 100
+        ax.barh(labels, values, left=left, label=language)
+        left += values
+
+    ax.set_xlabel("Share of repositories (%)")
+    ax.set_title("Language mix per user")
+    ax.legend(loc="upper left", bbox_to_anchor=(1, 1), fontsize="small")
+    fig.tight_layout()
+
+    return fig
+
+
+@cached(
+    _chart_cache,
+    key=_chart_key("language"),
+    lock=_chart_cache_lock,
+)
+def language_distribution_png(lang_stats: pd.DataFrame) -> bytes:
+    """
+    Return the language distribution chart as PNG bytes.
+    Identical inputs are rendered only once.
+    """
+    tracing.count("cache_misses_total", cache="charts")
+    return render_png(plot_language_distribution(lang_stats))
+
+
+@cached(
+    _chart_cache,
+    key=_chart_key("activity"),
+    lock=_chart_cache_lock,
+)
+def repos_by_year_png(activity_df: pd.DataFrame) -> bytes:
+    """
+    Return the repositories-per-year chart as PNG bytes.
+    Identical inputs are rendered only once.
+    """
+    tracing.count("cache_misses_total", cache="charts")
+    return render_png(plot_repos_by_year(activity_df))
+
+
+@cached(
+    _chart_cache,
+    key=_chart_key("language_bytes"),
+    lock=_chart_cache_lock,
+)
+def language_bytes_png(lang_bytes: pd.DataFrame) -> bytes:
+    """
+    Return the byte-weighted language chart as PNG bytes.
+    Identical inputs are rendered only once.
+    """
+    tracing.count("cache_misses_total", cache="charts")
+    return render_png(plot_language_bytes(lang_bytes))
+
+
+@cached(
+    _chart_cache,
+    key=_chart_key("comparison_stars"),
+    lock=_chart_cache_lock,
+)
+def comparison_stars_png(table: pd.DataFrame) -> bytes:
+    """
+    Return the comparison stars chart as PNG bytes.
+    Identical inputs are rendered only once.
+    """
+    tracing.count("cache_misses_total", cache="charts")
+    return render_png(plot_comparison_stars(table))
+
+
+@cached(
+    _chart_cache,
+    key=_chart_key("language_mix", index=True),
+    lock=_chart_cache_lock,
+)
+def language_mix_png(language_mix: pd.DataFrame) -> bytes:
+    """
+    Return the comparison language mix chart as PNG bytes.
+    Identical inputs are rendered only once.
+    """
+    tracing.count("cache_misses_total", cache="charts")
+    return render_png(plot_language_mix(language_mix))
+
+
 if __name__ == "__main__":
     # Quick manual test: generate and save charts for 'torvalds'
     from api_client import get_user_repos
@@ -65,9 +315,8 @@ if __name__ == "__main__":
     lang_stats = get_language_stats(df_repos)
     activity = get_activity_by_year(df_repos)
 
-    fig_lang = plot_language_distribution(lang_stats)
-    fig_activity = plot_repos_by_year(activity)
-
-    fig_lang.savefig("language_distribution.png")
-    fig_activity.savefig("repos_by_year.png")
+    with open("language_distribution.png", "wb") as f:
+        f.write(language_distribution_png(lang_stats))
+    with open("repos_by_year.png", "wb") as f:
+        f.write(repos_by_year_png(activity))
     print("Plots saved as 'language_distribution.png' and 'repos_by_year.png'")
@@ -0,0 +1,163 @@
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Classic token bucket used to pace outgoing requests.
+
+    `rate` tokens are added per second, up to `capacity`. `acquire()`
+    blocks until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class TokenState:
+    """
+    Last known rate limit budget of a single API token.
+
+    `token` is None for anonymous requests.
+    """
+
+    def __init__(self, token: Optional[str]):
+        self.token = token
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset: Optional[float] = None
+        self.blocked_until = 0.0
+
+    @property
+    def label(self) -> str:
+        if self.token is None:
+            return "anonymous"
+        return f"...{self.token[-4:]}"
+
+    def available_at(self, now: float) -> float:
+        """
+        Return the time from which this token may be used again.
+        """
+        if self.remaining == 0 and self.reset is not None and self.reset > now:
+            return max(self.reset, self.blocked_until)
+        return self.blocked_until
+
+
+class RateLimitScheduler:
+    """
+    Spread GitHub API requests over a pool of tokens.
+
+    Every request first takes a slot from a shared token bucket, then
+    picks the token with the largest remaining budget. Budgets are kept
+    up to date from the `X-RateLimit-*` and `Retry-After` headers of each
+    response. When every token is exhausted, `acquire()` sleeps until the
+    earliest reset, as long as that is at most `max_wait` seconds away.
+    """
+
+    def __init__(
+        self,
+        tokens=None,
+        rate: float = 10,
+        burst: float = 20,
+        max_wait: float = 60,
+    ):
+        tokens = [token for token in (tokens or []) if token]
+        self._states = [TokenState(token) for token in tokens] or [TokenState(None)]
+        self._bucket = TokenBucket(rate, burst)
+        self._lock = threading.Lock()
+        self.max_wait = max_wait
+
+    def acquire(self) -> TokenState:
+        """
+        Wait for a request slot and return the token state to use for it.
+
+        Raises:
+            RuntimeError: If every token is exhausted for longer than max_wait.
+        """
+        self._bucket.acquire()
+
+        while True:
+            with self._lock:
+                now = time.time()
+                ready = [s for s in self._states if s.available_at(now) <= now]
+                if ready:
+                    # Unknown budgets (no response seen yet) go first.
+                    return max(
+                        ready,
+                        key=lambda s: float("inf") if s.remaining is None else s.remaining,
+                    )
+                wait = min(s.available_at(now) for s in self._states) - now
+
+            if wait > self.max_wait:
+                raise RuntimeError(
+                    "GitHub API rate limit exhausted for all tokens; "
+                    f"next reset in {int(wait)} seconds."
+                )
+            time.sleep(max(wait, 0.05))
+
+    def update(self, state: TokenState, headers) -> None:
+        """
+        Record the rate limit headers of a response made with `state`.
+        """
+        with self._lock:
+            if "X-RateLimit-Limit" in headers:
+                state.limit = int(headers["X-RateLimit-Limit"])
+            if "X-RateLimit-Remaining" in headers:
+                state.remaining = int(headers["X-RateLimit-Remaining"])
+            if "X-RateLimit-Reset" in headers:
+                state.reset = float(headers["X-RateLimit-Reset"])
+
+            retry_after = parse_retry_after(headers)
+            if retry_after is not None:
+                state.blocked_until = max(state.blocked_until, time.time() + retry_after)
+
+    def remaining(self) -> list[dict]:
+        """
+        Return the last known budget of every token.
+        """
+        with self._lock:
+            return [
+                {
+                    "token": s.label,
+                    "limit": s.limit,
+                    "remaining": s.remaining,
+                    "reset": s.reset,
+                }
+                for s in self._states
+            ]
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """
+    Return the `Retry-After` delay in seconds, or None if absent.
+    """
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
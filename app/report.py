@@ -1,54 +1,66 @@
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
-from reportlab.platypus import (
-    SimpleDocTemplate,
-    Paragraph,
-    Spacer,
-    Table,
-    TableStyle,
-    Image,
-)
-
-import os
-import pandas as pd
+from io import BytesIO
 
+from typing import TYPE_CHECKING, Optional
 
+import tracing
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@tracing.traced("report.generate_pdf_report")
 def generate_pdf_report(
     username: str,
     user_profile: dict,
-    df_repos: pd.DataFrame,
-    lang_stats_df: pd.DataFrame,
-    activity_df: pd.DataFrame,
-    fig_lang,
-    fig_activity,
-    output_path: str = "github_profile_report.pdf",
-):
-    # ------------------------------------------------------------------
-    # 1. Save figures as temporary images
-    # ------------------------------------------------------------------
-    fig_lang_path = "temp_language_plot.png"
-    fig_activity_path = "temp_activity_plot.png"
+    df_repos: Optional["pd.DataFrame"],
+    lang_stats_df: "pd.DataFrame",
+    activity_df: "pd.DataFrame",
+    lang_chart_png: bytes,
+    activity_chart_png: bytes,
+    lang_bytes_df: Optional["pd.DataFrame"] = None,
+    lang_bytes_png: Optional[bytes] = None,
+) -> bytes:
+    """
+    Build the PDF report entirely in memory and return its bytes.
+
+    The byte-weighted language section is only included when
+    lang_bytes_df and lang_bytes_png are given.
+
+    Nothing is written to disk, so any number of reports can be built in
+    parallel in the same process.
 
-    fig_lang.savefig(fig_lang_path, dpi=120, bbox_inches="tight")
-    fig_activity.savefig(fig_activity_path, dpi=120, bbox_inches="tight")
+    ReportLab is imported here rather than at module level, so that the
+    dashboard only pays for it once a PDF is actually requested.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import (
+        Image,
+        Paragraph,
+        SimpleDocTemplate,
+        Spacer,
+        Table,
+        TableStyle,
+    )
 
     # ------------------------------------------------------------------
-    # 2. Create PDF document
+    # 1. Create PDF document
     # ------------------------------------------------------------------
-    doc = SimpleDocTemplate(output_path, pagesize=letter)
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
     styles = getSampleStyleSheet()
     story = []
 
     # ------------------------------------------------------------------
-    # 3. Title
+    # 2. Title
     # ------------------------------------------------------------------
     title = f"GitHub Profile Report – {username}"
     story.append(Paragraph(title, styles["Title"]))
     story.append(Spacer(1, 12))
 
     # ------------------------------------------------------------------
-    # 4. Profile summary
+    # 3. Profile summary
     # ------------------------------------------------------------------
     story.append(Paragraph("<b>User summary</b>", styles["Heading2"]))
     story.append(Spacer(1, 6))
@@ -56,7 +68,7 @@ def generate_pdf_report(
     profile_data = [
         ["Name", user_profile.get("name", "-")],
         ["Username", user_profile.get("login", "-")],
-        ["Bio", user_profile.get("bio", "-")],
+        ["Bio", user_profile.get("bio") or user_profile.get("description") or "-"],
         ["Location", user_profile.get("location", "-")],
         ["Public repos", str(user_profile.get("public_repos", "-"))],
         ["Followers", str(user_profile.get("followers", "-"))],
@@ -79,7 +91,7 @@ def generate_pdf_report(
     story.append(Spacer(1, 12))
 
     # ------------------------------------------------------------------
-    # 5. Language statistics
+    # 4. Language statistics
     # ------------------------------------------------------------------
     story.append(Paragraph("<b>Language distribution</b>", styles["Heading2"]))
     story.append(Spacer(1, 6))
@@ -104,9 +116,43 @@ def generate_pdf_report(
     story.append(Spacer(1, 12))
 
     # Insert language plot
-    story.append(Image(fig_lang_path, width=400, height=300))
+    story.append(Image(BytesIO(lang_chart_png), width=400, height=300))
     story.append(Spacer(1, 18))
 
+    # ------------------------------------------------------------------
+    # 5. Language share by bytes of code (optional enrichment)
+    # ------------------------------------------------------------------
+    if lang_bytes_df is not None and lang_bytes_png is not None:
+        story.append(
+            Paragraph("<b>Language share by bytes of code</b>", styles["Heading2"])
+        )
+        story.append(Spacer(1, 6))
+
+        if not lang_bytes_df.empty:
+            lang_bytes_rows = [
+                [language, f"{int(n_bytes):,}", f"{share:.1%}"]
+                for language, n_bytes, share in lang_bytes_df.itertuples(index=False)
+            ]
+            lang_bytes_table = Table([["language", "bytes", "share"]] + lang_bytes_rows)
+            lang_bytes_table.setStyle(
+                TableStyle(
+                    [
+                        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+                        ("BOX", (0, 0), (-1, -1), 1, colors.black),
+                        ("INNERGRID", (0, 0), (-1, -1), 0.3, colors.grey),
+                    ]
+                )
+            )
+            story.append(lang_bytes_table)
+        else:
+            story.append(Paragraph("No language data found.", styles["Normal"]))
+
+        story.append(Spacer(1, 12))
+
+        # Insert byte-weighted language plot
+        story.append(Image(BytesIO(lang_bytes_png), width=400, height=300))
+        story.append(Spacer(1, 18))
+
     # ------------------------------------------------------------------
     # 6. Activity metrics
     # ------------------------------------------------------------------
@@ -133,7 +179,7 @@ def generate_pdf_report(
     story.append(Spacer(1, 12))
 
     # Insert activity plot
-    story.append(Image(fig_activity_path, width=400, height=300))
+    story.append(Image(BytesIO(activity_chart_png), width=400, height=300))
     story.append(Spacer(1, 18))
 
     # ------------------------------------------------------------------
@@ -141,12 +187,119 @@ def generate_pdf_report(
     # ------------------------------------------------------------------
     doc.build(story)
 
+    return buffer.getvalue()
+
+
+@tracing.traced("report.generate_comparison_pdf_report")
+def generate_comparison_pdf_report(
+    comparison_table: "pd.DataFrame",
+    activity_df: "pd.DataFrame",
+    stars_chart_png: bytes,
+    language_mix_png: bytes,
+    title: str = "GitHub Profile Comparison",
+) -> bytes:
+    """
+    Build the PDF report of a multi-user comparison in memory and return
+    its bytes: the ranked table (see compare_users), both comparison
+    charts and the repositories created per user and year.
+    """
+    import pandas as pd
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import landscape, letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import (
+        Image,
+        Paragraph,
+        SimpleDocTemplate,
+        Spacer,
+        Table,
+        TableStyle,
+    )
+
+    grid_style = TableStyle(
+        [
+            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+            ("BOX", (0, 0), (-1, -1), 1, colors.black),
+            ("INNERGRID", (0, 0), (-1, -1), 0.3, colors.grey),
+            ("FONTSIZE", (0, 0), (-1, -1), 8),
+        ]
+    )
+
+    # ------------------------------------------------------------------
+    # 1. Create PDF document (landscape: the ranking is wide)
+    # ------------------------------------------------------------------
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=landscape(letter))
+    styles = getSampleStyleSheet()
+    story = []
+
     # ------------------------------------------------------------------
-    # 8. Delete temp images
+    # 2. Title
     # ------------------------------------------------------------------
-    if os.path.exists(fig_lang_path):
-        os.remove(fig_lang_path)
-    if os.path.exists(fig_activity_path):
-        os.remove(fig_activity_path)
+    story.append(Paragraph(title, styles["Title"]))
+    story.append(Paragraph(f"{len(comparison_table)} users compared", styles["Normal"]))
+    story.append(Spacer(1, 12))
+
+    # ------------------------------------------------------------------
+    # 3. Ranking
+    # ------------------------------------------------------------------
+    story.append(Paragraph("<b>Ranking</b>", styles["Heading2"]))
+    story.append(Spacer(1, 6))
+
+    header = ["#", "User", "Repos", "Stars", "Forks", "Max stars",
+              "Active repos", "Top language", "Languages", "Last push"]
+    rows = [
+        [
+            row.rank,
+            row.user,
+            row.repo_count,
+            f"{row.total_stars:,}",
+            f"{row.total_forks:,}",
+            f"{row.max_stars:,}",
+            row.active_repos,
+            row.top_language if isinstance(row.top_language, str) else "-",
+            row.language_count,
+            row.last_pushed_at.strftime("%Y-%m-%d") if pd.notna(row.last_pushed_at) else "-",
+        ]
+        for row in comparison_table.itertuples(index=False)
+    ]
+    # repeatRows keeps the header on every page of long rankings
+    ranking_table = Table([header] + rows, repeatRows=1)
+    ranking_table.setStyle(grid_style)
+    story.append(ranking_table)
+    story.append(Spacer(1, 18))
+
+    # ------------------------------------------------------------------
+    # 4. Charts
+    # ------------------------------------------------------------------
+    story.append(Paragraph("<b>Stars and language mix</b>", styles["Heading2"]))
+    story.append(Spacer(1, 6))
+    story.append(Image(BytesIO(stars_chart_png), width=400, height=300))
+    story.append(Spacer(1, 12))
+    story.append(Image(BytesIO(language_mix_png), width=480, height=320))
+    story.append(Spacer(1, 18))
+
+    # ------------------------------------------------------------------
+    # 5. Activity metrics
+    # ------------------------------------------------------------------
+    story.append(Paragraph("<b>Repositories created per year</b>", styles["Heading2"]))
+    story.append(Spacer(1, 6))
+
+    if not activity_df.empty and len(activity_df.columns):
+        years = activity_df.columns.tolist()[-10:]
+        activity_rows = [
+            [user] + activity_df.loc[user, years].tolist()
+            for user in comparison_table["user"]
+        ]
+        activity_table = Table([["User"] + years] + activity_rows, repeatRows=1)
+        activity_table.setStyle(grid_style)
+        story.append(activity_table)
+    else:
+        story.append(Paragraph("No activity data found.", styles["Normal"]))
+
+    # ------------------------------------------------------------------
+    # 6. Build PDF
+    # ------------------------------------------------------------------
+    doc.build(story)
 
-    return output_path
+    return buffer.getvalue()
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional
+
+import pandas as pd
+from cachetools import LRUCache
+
+from plots import frame_hash
+from report import generate_comparison_pdf_report, generate_pdf_report
+
+
+# Worker processes building PDFs, and number of finished PDFs kept
+REPORT_WORKERS = 2
+REPORT_CACHE_SIZE = 32
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def report_job_id(
+    username: str,
+    user_profile: dict,
+    df_repos: Optional[pd.DataFrame],
+    lang_stats_df: pd.DataFrame,
+    activity_df: pd.DataFrame,
+    lang_chart_png: bytes,
+    activity_chart_png: bytes,
+    lang_bytes_df: Optional[pd.DataFrame] = None,
+    lang_bytes_png: Optional[bytes] = None,
+) -> str:
+    """
+    Return a job ID derived from the report inputs, so that identical
+    requests (same user, same data snapshot) map to the same job.
+    """
+    digest = hashlib.sha256(username.encode())
+    digest.update(json.dumps(user_profile, sort_keys=True, default=str).encode())
+    for df in (df_repos, lang_stats_df, activity_df, lang_bytes_df):
+        digest.update(frame_hash(df).encode() if df is not None else b"-")
+    for png in (lang_chart_png, activity_chart_png, lang_bytes_png):
+        digest.update(hashlib.sha256(png or b"").digest())
+    return digest.hexdigest()[:16]
+
+
+def comparison_job_id(
+    comparison_table: pd.DataFrame,
+    activity_df: pd.DataFrame,
+    stars_chart_png: bytes,
+    language_mix_png: bytes,
+    title: str = "GitHub Profile Comparison",
+) -> str:
+    """
+    Return a job ID derived from the inputs of a comparison report.
+    """
+    digest = hashlib.sha256(b"comparison:" + title.encode())
+    for df in (comparison_table, activity_df):
+        digest.update(frame_hash(df).encode())
+    for png in (stars_chart_png, language_mix_png):
+        digest.update(hashlib.sha256(png).digest())
+    return digest.hexdigest()[:16]
+
+
+class ReportJobQueue:
+    """
+    Build PDF reports in a pool of worker processes.
+
+    Jobs are identified by a hash of their inputs: submitting the same
+    report twice returns the same job ID, and while it is queued or
+    running both callers share the one build. Finished PDFs are kept in a
+    bounded LRU cache for repeat downloads.
+    """
+
+    def __init__(self, max_workers: int = REPORT_WORKERS, cache_size: int = REPORT_CACHE_SIZE):
+        # "spawn" avoids forking a multi-threaded Streamlit server.
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self._lock = threading.Lock()
+        self._pending: dict[str, Future] = {}
+        self._finished = LRUCache(maxsize=cache_size)
+        self._errors = LRUCache(maxsize=cache_size)
+
+    def submit(self, **report_kwargs) -> str:
+        """
+        Queue a report build (same arguments as generate_pdf_report) and
+        return its job ID.
+
+        df_repos only feeds the job ID: the report does not read it, so it
+        is not copied to the worker process.
+        """
+        job_id = report_job_id(**report_kwargs)
+        return self._submit(job_id, generate_pdf_report, {**report_kwargs, "df_repos": None})
+
+    def submit_comparison(self, **report_kwargs) -> str:
+        """
+        Queue a comparison report build (same arguments as
+        generate_comparison_pdf_report) and return its job ID.
+        """
+        return self._submit(
+            comparison_job_id(**report_kwargs), generate_comparison_pdf_report, report_kwargs
+        )
+
+    def _submit(self, job_id: str, build, report_kwargs: dict) -> str:
+        with self._lock:
+            if job_id in self._finished or job_id in self._pending:
+                return job_id
+
+            self._errors.pop(job_id, None)
+            future = self._executor.submit(build, **report_kwargs)
+            self._pending[job_id] = future
+
+        future.add_done_callback(lambda f: self._on_done(job_id, f))
+        return job_id
+
+    def status(self, job_id: str) -> dict:
+        """
+        Return the status of a job: "queued", "running", "done", "failed"
+        or "unknown", with a progress fraction and an optional error.
+        """
+        with self._lock:
+            if job_id in self._finished:
+                return {"job_id": job_id, "status": "done", "progress": 1.0, "error": None}
+            if job_id in self._errors:
+                return {
+                    "job_id": job_id,
+                    "status": "failed",
+                    "progress": 1.0,
+                    "error": self._errors[job_id],
+                }
+            future = self._pending.get(job_id)
+
+        if future is None:
+            return {"job_id": job_id, "status": "unknown", "progress": 0.0, "error": None}
+        if future.running():
+            return {"job_id": job_id, "status": "running", "progress": 0.5, "error": None}
+        return {"job_id": job_id, "status": "queued", "progress": 0.0, "error": None}
+
+    def result(self, job_id: str) -> Optional[bytes]:
+        """
+        Return the PDF bytes of a finished job, or None.
+        """
+        with self._lock:
+            return self._finished.get(job_id)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _on_done(self, job_id: str, future: Future) -> None:
+        with self._lock:
+            self._pending.pop(job_id, None)
+            if future.cancelled():
+                return
+            error = future.exception()
+            if error is not None:
+                self._errors[job_id] = str(error)
+            else:
+                self._finished[job_id] = future.result()
+
+
+def get_report_queue() -> ReportJobQueue:
+    """
+    Return the process-wide report job queue.
+    """
+    global _queue
+
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = ReportJobQueue()
+
+    return _queue
@@ -0,0 +1,343 @@
+"""
+Headless HTTP API serving the analysis as JSON and PDF.
+
+Usage:
+    python app/server.py --port 8000 --processes 2
+    python app/server.py --replay api.jsonl.gz --replay-latency 0.05   (offline)
+
+Endpoints:
+    GET /users/{username}              profile and summary (totals, top repos)
+    GET /users/{username}/repos        repository table, sorted by stars
+    GET /users/{username}/languages    repositories per language
+    GET /users/{username}/activity     repositories created per year
+    GET /users/{username}/report.pdf   PDF report
+    GET /metrics                       Prometheus metrics (with --metrics)
+    GET /cache                         memory used by the cached analyses and PDFs
+
+Requests are handled on a tornado event loop, so idle and waiting
+clients cost no threads; fetching and computing run on a small thread
+pool. Concurrent requests for the same user share one in-flight analysis
+(single-flight), and finished analyses are kept in a TTL cache bounded
+by memory (see analysis_cache.py) shared by all endpoints, with every
+JSON body serialized once.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+import pandas as pd
+import tornado.httpserver
+import tornado.netutil
+import tornado.process
+import tornado.web
+
+import tracing
+from analysis_cache import ANALYSIS_CACHE_BYTES, ANALYSIS_TTL, AnalysisCache
+from api_client import configure_cache, configure_transport, get_user_profile, get_user_repos
+from data_processing import build_repos_dataframe, summarize_repos
+from plots import language_distribution_png, repos_by_year_png
+from report import generate_pdf_report
+
+
+# Threads per process fetching from GitHub and computing analyses
+COMPUTE_WORKERS = 8
+
+# Memory budget per process of the finished PDFs (analyses: ANALYSIS_CACHE_BYTES)
+REPORT_CACHE_BYTES = 64 * 1024 * 1024
+
+# Number of repositories in the summary's top lists
+TOP_N = 5
+
+PROFILE_FIELDS = [
+    "login",
+    "name",
+    "bio",
+    "location",
+    "avatar_url",
+    "html_url",
+    "public_repos",
+    "followers",
+    "following",
+    "created_at",
+]
+
+REPO_TABLE_COLUMNS = ["name", "language", "stars", "forks", "created_at", "pushed_at", "html_url"]
+
+
+class SingleFlight:
+    """
+    Run blocking functions on an executor, at most once per key at a
+    time, and cache their results.
+
+    Callers asking for a key that is already being computed await the
+    same future instead of starting another computation. Failures are not
+    cached, so the next request retries. Only used from the event loop
+    thread, so no locking is needed.
+    """
+
+    def __init__(self, cache: AnalysisCache, executor: Executor):
+        self.cache = cache
+        self._executor = executor
+        self._in_flight: dict[object, asyncio.Future] = {}
+
+    async def get(self, key, fn: Callable, *args):
+        tracing.count("cache_lookups_total", cache="server")
+        try:
+            return self.cache[key]
+        except KeyError:
+            pass
+
+        future = self._in_flight.get(key)
+        if future is None:
+            tracing.count("cache_misses_total", cache="server")
+            future = asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+            self._in_flight[key] = future
+            future.add_done_callback(lambda f: self._done(key, f))
+        else:
+            tracing.count("server_coalesced_total")
+
+        # A client going away must not cancel the computation for the others
+        return await asyncio.shield(future)
+
+    def _done(self, key, future: asyncio.Future) -> None:
+        self._in_flight.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            self.cache[key] = future.result()
+
+
+def _records(df: pd.DataFrame) -> list[dict]:
+    # to_json handles NaN / NaT and ISO timestamps the way JSON clients expect
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+
+def _dumps(payload: dict) -> bytes:
+    return json.dumps(payload).encode()
+
+
+def analyze(username: str) -> dict:
+    """
+    Fetch and analyze a user, pre-serializing every JSON response.
+
+    Raises:
+        ValueError: If the user is not found (404).
+        RuntimeError: For other non-success HTTP responses.
+    """
+    user_profile = get_user_profile(username)
+    df_repos = build_repos_dataframe(get_user_repos(username))
+    summary = summarize_repos(df_repos, n=TOP_N)
+
+    profile = {field: user_profile.get(field) for field in PROFILE_FIELDS}
+    profile["bio"] = profile["bio"] or user_profile.get("description")
+
+    return {
+        "fetched_at": time.time(),
+        "user_profile": user_profile,
+        "df_repos": df_repos,
+        "summary": summary,
+        "bodies": {
+            "summary": _dumps(
+                {
+                    "profile": profile,
+                    "repo_count": summary.repo_count,
+                    "total_stars": summary.total_stars,
+                    "total_forks": summary.total_forks,
+                    "top_stars": _records(summary.top_stars[REPO_TABLE_COLUMNS]),
+                    "top_recent": _records(summary.top_recent[REPO_TABLE_COLUMNS]),
+                }
+            ),
+            "repos": _dumps(
+                {"repos": _records(df_repos[REPO_TABLE_COLUMNS].take(summary.stars_order))}
+            ),
+            "languages": _dumps({"languages": _records(summary.lang_stats)}),
+            "activity": _dumps({"activity": _records(summary.activity)}),
+        },
+    }
+
+
+def build_report(username: str, analysis: dict) -> bytes:
+    """
+    Render the PDF report of an analysis.
+    """
+    summary = analysis["summary"]
+    return generate_pdf_report(
+        username=username,
+        user_profile=analysis["user_profile"],
+        df_repos=analysis["df_repos"],
+        lang_stats_df=summary.lang_stats,
+        activity_df=summary.activity,
+        lang_chart_png=language_distribution_png(summary.lang_stats),
+        activity_chart_png=repos_by_year_png(summary.activity),
+    )
+
+
+class BaseHandler(tornado.web.RequestHandler):
+    """
+    Shared error handling: errors are returned as {"error": message}.
+    """
+
+    def write_error(self, status_code: int, **kwargs) -> None:
+        error = kwargs.get("exc_info", (None, None, None))[1]
+        message = getattr(error, "log_message", None) or self._reason
+        self.set_header("Content-Type", "application/json; charset=utf-8")
+        self.finish(_dumps({"error": message}))
+
+    async def analysis(self, username: str) -> dict:
+        """
+        Return the (possibly shared or cached) analysis of a user.
+
+        Raises:
+            tornado.web.HTTPError: 404 for unknown users, 502 when the
+                GitHub API fails.
+        """
+        try:
+            return await self.settings["analyses"].get(username.lower(), analyze, username)
+        except ValueError as e:
+            raise tornado.web.HTTPError(404, str(e))
+        except Exception as e:
+            raise tornado.web.HTTPError(502, f"GitHub API error: {e}")
+
+
+class AnalysisHandler(BaseHandler):
+    """
+    Serve one of the pre-serialized JSON views of an analysis.
+    """
+
+    def initialize(self, view: str) -> None:
+        self.view = view
+
+    async def get(self, username: str) -> None:
+        with tracing.stage(f"server.{self.view}"):
+            analysis = await self.analysis(username)
+        self.set_header("Content-Type", "application/json; charset=utf-8")
+        self.finish(analysis["bodies"][self.view])
+
+
+class ReportHandler(BaseHandler):
+    async def get(self, username: str) -> None:
+        with tracing.stage("server.report"):
+            analysis = await self.analysis(username)
+            key = (username.lower(), analysis["fetched_at"])
+            pdf = await self.settings["reports"].get(key, build_report, username, analysis)
+
+        self.set_header("Content-Type", "application/pdf")
+        self.set_header(
+            "Content-Disposition", f'attachment; filename="github_profile_report_{username}.pdf"'
+        )
+        self.finish(pdf)
+
+
+class CacheHandler(BaseHandler):
+    def get(self) -> None:
+        caches = [self.settings["analyses"].cache, self.settings["reports"].cache]
+        self.set_header("Content-Type", "application/json; charset=utf-8")
+        self.finish(
+            _dumps(
+                {
+                    "caches": [
+                        {**cache.stats(), "entries_detail": cache.entries()}
+                        for cache in caches
+                    ]
+                }
+            )
+        )
+
+
+class MetricsHandler(BaseHandler):
+    def get(self) -> None:
+        if not tracing.is_enabled():
+            raise tornado.web.HTTPError(404, "Metrics are disabled (start with --metrics).")
+        self.set_header("Content-Type", "text/plain; version=0.0.4")
+        self.finish(tracing.to_prometheus())
+
+
+def make_app(
+    workers: int = COMPUTE_WORKERS,
+    cache_bytes: int = ANALYSIS_CACHE_BYTES,
+    ttl: float = ANALYSIS_TTL,
+) -> tornado.web.Application:
+    """
+    Build the tornado application with its executor and caches.
+    """
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis")
+    user = r"/users/([A-Za-z0-9-]{1,39})"
+
+    return tornado.web.Application(
+        [
+            (user, AnalysisHandler, {"view": "summary"}),
+            (user + r"/repos", AnalysisHandler, {"view": "repos"}),
+            (user + r"/languages", AnalysisHandler, {"view": "languages"}),
+            (user + r"/activity", AnalysisHandler, {"view": "activity"}),
+            (user + r"/report\.pdf", ReportHandler),
+            (r"/metrics", MetricsHandler),
+            (r"/cache", CacheHandler),
+        ],
+        analyses=SingleFlight(AnalysisCache("server", cache_bytes, ttl), executor),
+        reports=SingleFlight(AnalysisCache("reports", REPORT_CACHE_BYTES, ttl), executor),
+    )
+
+
+async def serve(sockets: list, workers: int, cache_bytes: int, ttl: float) -> None:
+    server = tornado.httpserver.HTTPServer(make_app(workers, cache_bytes, ttl))
+    server.add_sockets(sockets)
+    await asyncio.Event().wait()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve profile analyses over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--processes", type=int, default=1,
+        help="Worker processes sharing the port (0 = one per CPU)",
+    )
+    parser.add_argument("--workers", type=int, default=COMPUTE_WORKERS, help="Threads per process")
+    parser.add_argument(
+        "--cache-mb", type=int, default=ANALYSIS_CACHE_BYTES // 2**20,
+        help="Memory budget of the cached analyses per process (MiB)",
+    )
+    parser.add_argument("--ttl", type=float, default=ANALYSIS_TTL, help="Seconds an analysis is reused")
+    parser.add_argument("--metrics", action="store_true", help="Enable tracing and GET /metrics")
+    transport = parser.add_mutually_exclusive_group()
+    transport.add_argument(
+        "--record", metavar="ARCHIVE", help="Record every API exchange to ARCHIVE (gzip JSON lines)"
+    )
+    transport.add_argument(
+        "--replay", metavar="ARCHIVE", help="Serve API responses from ARCHIVE, without network"
+    )
+    parser.add_argument(
+        "--replay-latency", type=float, default=0.0, metavar="SECONDS",
+        help="Simulated latency of every replayed response",
+    )
+    parser.add_argument(
+        "--replay-rate-limit", type=int, metavar="N",
+        help="Simulate a budget of N requests per hour while replaying",
+    )
+    args = parser.parse_args(argv)
+
+    if args.metrics:
+        tracing.enable()
+    if args.record or args.replay:
+        # Without the disk cache, a replay sends exactly the recorded requests
+        configure_cache(None)
+        configure_transport(
+            record=args.record,
+            replay=args.replay,
+            latency=args.replay_latency,
+            rate_limit=args.replay_rate_limit,
+        )
+
+    # Bind before forking so that every process accepts on the same socket
+    sockets = tornado.netutil.bind_sockets(args.port, args.host)
+    if args.processes != 1:
+        tornado.process.fork_processes(args.processes)
+
+    print(f"Serving on http://{args.host}:{args.port}")
+    asyncio.run(serve(sockets, args.workers, args.cache_mb * 2**20, args.ttl))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from api_client import get_user_profile, get_user_repos, get_user_repos_updated_since
+from data_processing import (
+    GITHUB_TIME_FORMAT,
+    RepoSummary,
+    build_repos_dataframe,
+    drop_duplicate_repos,
+    merge_repos_dataframe,
+    summarize_repos,
+    update_summary,
+)
+
+
+# Directory holding one repository frame + sync metadata per user
+SNAPSHOT_DIR = ".snapshots"
+
+# Margin applied to the last sync time, to absorb clock skew between
+# this machine and GitHub
+SYNC_SKEW = timedelta(minutes=5)
+
+
+class SnapshotStore:
+    """
+    Per-user store of the last fetched repository frame and sync time.
+
+    Each user gets `<username>.parquet` (the build_repos_dataframe
+    output) and `<username>.json` (sync metadata and the aggregates of
+    the frame, so they can be updated rather than rebuilt). Files are
+    written to a temporary name and renamed, so a crash never leaves a
+    half-written snapshot behind.
+    """
+
+    def __init__(self, directory: str = SNAPSHOT_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, username: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{username.lower()}{suffix}")
+
+    def load(self, username: str) -> Optional[tuple[pd.DataFrame, dict]]:
+        """
+        Return (df_repos, metadata) for a user, or None if there is no
+        snapshot yet.
+        """
+        meta_path = self._path(username, ".json")
+        frame_path = self._path(username, ".parquet")
+        if not (os.path.exists(meta_path) and os.path.exists(frame_path)):
+            return None
+
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        return pd.read_parquet(frame_path), meta
+
+    def save(
+        self,
+        username: str,
+        df_repos: pd.DataFrame,
+        synced_at: str,
+        summary: Optional[RepoSummary] = None,
+        n: int = 5,
+    ) -> None:
+        """
+        Store a user's repository frame, the time it was synced and
+        optionally its summary, whose top-N lists hold `n` repositories.
+        """
+        frame_path = self._path(username, ".parquet")
+        meta_path = self._path(username, ".json")
+
+        df_repos.to_parquet(frame_path + ".tmp", index=False)
+        os.replace(frame_path + ".tmp", frame_path)
+
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            meta = {"username": username, "synced_at": synced_at}
+            if summary is not None:
+                meta["summary"] = summary_to_json(summary, n)
+            json.dump(meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+
+def summary_to_json(summary: RepoSummary, n: int) -> dict:
+    """
+    Return the aggregates of a RepoSummary as JSON-serializable data. The
+    top-N lists are stored as full names (their rows are in the frame).
+    """
+    return {
+        "n": n,
+        "repo_count": summary.repo_count,
+        "total_stars": summary.total_stars,
+        "total_forks": summary.total_forks,
+        "languages": [[str(k), int(v)] for k, v in summary.lang_stats.itertuples(index=False)],
+        "years": [[int(k), int(v)] for k, v in summary.activity.itertuples(index=False)],
+        "top_stars": summary.top_stars["full_name"].tolist(),
+        "top_recent": summary.top_recent["full_name"].tolist(),
+    }
+
+
+def summary_from_json(data: dict, df_repos: pd.DataFrame) -> RepoSummary:
+    """
+    Rebuild a RepoSummary stored by summary_to_json, taking the top-N rows
+    from the frame it summarizes. stars_order is left empty.
+    """
+    full_names = pd.Index(df_repos["full_name"])
+
+    def rows(names: list) -> pd.DataFrame:
+        return df_repos.iloc[full_names.get_indexer(names)].reset_index(drop=True)
+
+    return RepoSummary(
+        repo_count=data["repo_count"],
+        total_stars=data["total_stars"],
+        total_forks=data["total_forks"],
+        lang_stats=pd.DataFrame(data["languages"], columns=["language", "repo_count"]),
+        activity=pd.DataFrame(data["years"], columns=["year", "repo_count"]),
+        top_stars=rows(data["top_stars"]),
+        top_recent=rows(data["top_recent"]),
+        stars_order=np.empty(0, dtype=np.int64),
+    )
+
+
+def refresh_user(
+    username: str, store: SnapshotStore, n: int = 5
+) -> tuple[dict, pd.DataFrame, RepoSummary, int]:
+    """
+    Return (profile, df_repos, summary, repos_fetched) for a user, reusing
+    the stored snapshot when there is one. `n` is the length of the top-N
+    lists of the summary.
+
+    Only repositories updated since the last sync are downloaded (with
+    early pagination cutoff) and merged into the stored frame, and the
+    stored aggregates are updated for those rows (see update_summary).
+    Deleted or renamed repositories cannot be seen this way, so when the
+    merged count disagrees with the profile's public_repos a full fetch is
+    done.
+
+    Raises:
+        ValueError: If the user is not found (404).
+        RuntimeError: For other non-success HTTP responses.
+    """
+    started_at = datetime.now(timezone.utc)
+    user_profile = get_user_profile(username)
+    snapshot = store.load(username)
+
+    df_repos = summary = None
+    repos_fetched = 0
+
+    if snapshot is not None:
+        base, meta = snapshot
+        # Snapshots saved before duplicates were dropped can hold a
+        # repository twice; their stored aggregates count it twice too.
+        stored = meta.get("summary")
+        if base["full_name"].duplicated().any():
+            base = base.drop_duplicates("full_name", ignore_index=True)
+            stored = None
+
+        last_sync = datetime.strptime(meta["synced_at"], GITHUB_TIME_FORMAT)
+        since = (last_sync - SYNC_SKEW).strftime(GITHUB_TIME_FORMAT)
+
+        changed_json = drop_duplicate_repos(get_user_repos_updated_since(username, since))
+        repos_fetched = len(changed_json)
+        changed = build_repos_dataframe(changed_json)
+        merged = merge_repos_dataframe(base, changed)
+        if len(merged) == user_profile.get("public_repos", len(merged)):
+            df_repos = merged
+            if stored is not None and stored["n"] == n:
+                summary = update_summary(
+                    summary_from_json(stored, base), base, changed, merged, n=n
+                )
+            else:
+                # Snapshot written without (matching) aggregates
+                summary = summarize_repos(merged, n=n)
+
+    if df_repos is None:
+        repos_json = drop_duplicate_repos(get_user_repos(username))
+        repos_fetched = len(repos_json)
+        df_repos = build_repos_dataframe(repos_json)
+        summary = summarize_repos(df_repos, n=n)
+
+    store.save(username, df_repos, started_at.strftime(GITHUB_TIME_FORMAT), summary, n)
+    return user_profile, df_repos, summary, repos_fetched
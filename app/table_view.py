@@ -0,0 +1,124 @@
+import threading
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from cachetools import LRUCache
+
+import tracing
+
+
+# Columns of the interactive repository table
+TABLE_COLUMNS = ["name", "language", "stars", "forks", "created_at", "pushed_at"]
+
+# Rows per page offered by the dashboard
+PAGE_SIZES = [25, 50, 100, 250]
+
+# Sorted / filtered row orders kept per table (one per distinct query)
+ORDER_CACHE_SIZE = 32
+
+
+class RepoTableView:
+    """
+    Server-side sorting, filtering and paging of a repository frame.
+
+    The frame is converted to an Arrow table once. Every distinct
+    (sort, filter) combination is computed once as an array of row
+    indices and cached, so paging through it only takes the rows of the
+    requested window; no interaction ever serializes or copies the whole
+    table. Safe to share between sessions.
+    """
+
+    def __init__(self, df_repos: pd.DataFrame, columns: Optional[list[str]] = None):
+        columns = columns or TABLE_COLUMNS
+        table = pa.Table.from_pandas(df_repos[columns], preserve_index=False)
+
+        # Categorical columns arrive dictionary-encoded; plain strings keep
+        # every compute kernel (equality, substring match) available.
+        for i, field in enumerate(table.schema):
+            if pa.types.is_dictionary(field.type):
+                table = table.set_column(i, field.name, table.column(i).cast(pa.string()))
+
+        self.table = table
+        self.columns = columns
+        self._orders = LRUCache(maxsize=ORDER_CACHE_SIZE)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Return the memory the view can hold: the table plus a full order
+        cache (ORDER_CACHE_SIZE orders of one 8-byte index per row).
+
+        The order cache fills as users sort and filter, after the view was
+        sized into the analysis cache, so its room is reserved up front.
+        """
+        return self.table.nbytes + ORDER_CACHE_SIZE * self.table.num_rows * 8
+
+    @property
+    def languages(self) -> list[str]:
+        """
+        Return the distinct languages present, sorted.
+        """
+        if "language" not in self.columns:
+            return []
+        values = pc.unique(self.table.column("language")).drop_null()
+        return sorted(values.to_pylist())
+
+    def window(
+        self,
+        offset: int,
+        limit: int,
+        sort_by: str = "stars",
+        descending: bool = True,
+        query: str = "",
+        language: Optional[str] = None,
+    ) -> tuple[pd.DataFrame, int]:
+        """
+        Return the rows [offset, offset + limit) of the table sorted by
+        `sort_by` and filtered by a case-insensitive name substring and an
+        exact language, along with the number of matching rows.
+        """
+        with tracing.stage("table.window"):
+            order = self._order(sort_by, descending, query.strip(), language)
+            rows = self.table.take(order.slice(offset, limit))
+            return rows.to_pandas(), len(order)
+
+    def _order(
+        self, sort_by: str, descending: bool, query: str, language: Optional[str]
+    ) -> pa.Array:
+        key = (sort_by, descending, query, language)
+        tracing.count("cache_lookups_total", cache="table")
+        with self._lock:
+            order = self._orders.get(key)
+        if order is not None:
+            return order
+
+        tracing.count("cache_misses_total", cache="table")
+        if query or language:
+            # Filtering keeps the sorted order, so reuse the unfiltered sort
+            order = self._order(sort_by, descending, "", None)
+            mask = self._mask(query, language)
+            order = pc.filter(order, pc.array_take(mask, order))
+        else:
+            sort_keys = [(sort_by, "descending" if descending else "ascending")]
+            if sort_by != "name" and "name" in self.columns:
+                sort_keys.append(("name", "ascending"))
+            order = pc.sort_indices(self.table, sort_keys=sort_keys, null_placement="at_end")
+
+        with self._lock:
+            self._orders[key] = order
+        return order
+
+    def _mask(self, query: str, language: Optional[str]) -> pa.Array:
+        mask = None
+        if query:
+            mask = pc.match_substring(self.table.column("name"), query, ignore_case=True)
+        if language:
+            matches = pc.equal(self.table.column("language"), language)
+            mask = matches if mask is None else pc.and_(mask, matches)
+        return pc.fill_null(mask, False).combine_chunks()
@@ -0,0 +1,259 @@
+"""
+Lightweight in-process tracing: stage durations, counters and gauges.
+
+Disabled by default (set GITHUB_ANALYZER_TRACE=1 or call enable()). While
+disabled, every recording function returns after a single flag check, so
+the instrumentation left in the code paths costs next to nothing.
+
+Metrics can be exported as JSON lines (one object per metric) or in the
+Prometheus text exposition format.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Callable, Optional
+
+
+# Prefix of every exported Prometheus metric
+METRIC_PREFIX = "github_analyzer"
+
+_enabled = os.environ.get("GITHUB_ANALYZER_TRACE", "") not in ("", "0")
+_lock = threading.Lock()
+
+# stage -> [calls, total seconds, max seconds]
+_stages: dict[str, list] = defaultdict(lambda: [0, 0.0, 0.0])
+# (name, sorted label items) -> value
+_counters: dict[tuple, float] = defaultdict(float)
+_gauges: dict[tuple, float] = {}
+
+_disabled_stage = nullcontext()
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    """
+    Drop everything recorded so far.
+    """
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+        _gauges.clear()
+
+
+def _record_stage(name: str, seconds: float) -> None:
+    with _lock:
+        stats = _stages[name]
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] = max(stats[2], seconds)
+
+
+@contextmanager
+def _timed_stage(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record_stage(name, time.perf_counter() - start)
+
+
+def stage(name: str):
+    """
+    Context manager recording the duration of the enclosed block.
+    """
+    if not _enabled:
+        return _disabled_stage
+    return _timed_stage(name)
+
+
+def traced(name: str) -> Callable:
+    """
+    Decorator recording the duration of every call of a function.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _record_stage(name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def count(name: str, value: float = 1, **labels) -> None:
+    """
+    Add `value` to a counter, e.g. count("http_requests_total", status=200).
+    """
+    if not _enabled:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] += value
+
+
+def set_gauge(name: str, value: Optional[float], **labels) -> None:
+    """
+    Set a gauge to its latest value (ignored when value is None).
+    """
+    if not _enabled or value is None:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _gauges[key] = value
+
+
+def cache_hit_ratios() -> dict[str, float]:
+    """
+    Return the hit ratio of every cache that reported lookups, computed
+    from the cache_lookups_total and cache_misses_total counters.
+    """
+    lookups: dict[str, float] = defaultdict(float)
+    misses: dict[str, float] = defaultdict(float)
+    with _lock:
+        for (name, labels), value in _counters.items():
+            cache = dict(labels).get("cache")
+            if name == "cache_lookups_total":
+                lookups[cache] += value
+            elif name == "cache_misses_total":
+                misses[cache] += value
+
+    return {
+        cache: max(0.0, 1 - misses[cache] / total)
+        for cache, total in lookups.items()
+        if total
+    }
+
+
+def snapshot() -> dict:
+    """
+    Return everything recorded so far as plain dicts and lists.
+    """
+    with _lock:
+        stages = [
+            {
+                "stage": name,
+                "calls": calls,
+                "total_s": total,
+                "mean_s": total / calls if calls else 0.0,
+                "max_s": longest,
+            }
+            for name, (calls, total, longest) in _stages.items()
+        ]
+        counters = [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in _counters.items()
+        ]
+        gauges = [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in _gauges.items()
+        ]
+
+    return {
+        "timestamp": time.time(),
+        "stages": sorted(stages, key=lambda s: s["total_s"], reverse=True),
+        "counters": sorted(counters, key=lambda c: (c["name"], sorted(c["labels"].items()))),
+        "gauges": sorted(gauges, key=lambda g: (g["name"], sorted(g["labels"].items()))),
+        "cache_hit_ratios": cache_hit_ratios(),
+    }
+
+
+def to_json_lines() -> str:
+    """
+    Return the current metrics as JSON lines, one object per stage,
+    counter, gauge and cache, all sharing the same timestamp.
+    """
+    data = snapshot()
+    ts = data["timestamp"]
+
+    lines = [{"ts": ts, "type": "stage", **s} for s in data["stages"]]
+    lines += [{"ts": ts, "type": "counter", **c} for c in data["counters"]]
+    lines += [{"ts": ts, "type": "gauge", **g} for g in data["gauges"]]
+    lines += [
+        {"ts": ts, "type": "cache_hit_ratio", "cache": cache, "value": ratio}
+        for cache, ratio in data["cache_hit_ratios"].items()
+    ]
+    return "".join(json.dumps(line) + "\n" for line in lines)
+
+
+def _prometheus_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    items = []
+    for key, value in sorted(labels.items()):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        items.append(f'{key}="{value}"')
+    return "{" + ",".join(items) + "}"
+
+
+def to_prometheus() -> str:
+    """
+    Return the current metrics in the Prometheus text exposition format.
+    """
+    data = snapshot()
+    out = []
+
+    def family(name: str, kind: str, samples: list[tuple[dict, float]]) -> None:
+        metric = f"{METRIC_PREFIX}_{name}"
+        out.append(f"# TYPE {metric} {kind}")
+        for labels, value in samples:
+            out.append(f"{metric}{_prometheus_labels(labels)} {value}")
+
+    if data["stages"]:
+        family("stage_calls_total", "counter",
+               [({"stage": s["stage"]}, s["calls"]) for s in data["stages"]])
+        family("stage_seconds_total", "counter",
+               [({"stage": s["stage"]}, s["total_s"]) for s in data["stages"]])
+        family("stage_seconds_max", "gauge",
+               [({"stage": s["stage"]}, s["max_s"]) for s in data["stages"]])
+
+    for kind, entries in (("counter", data["counters"]), ("gauge", data["gauges"])):
+        by_name: dict[str, list] = defaultdict(list)
+        for entry in entries:
+            by_name[entry["name"]].append((entry["labels"], entry["value"]))
+        for name, samples in by_name.items():
+            family(name, kind, samples)
+
+    if data["cache_hit_ratios"]:
+        family("cache_hit_ratio", "gauge",
+               [({"cache": c}, r) for c, r in data["cache_hit_ratios"].items()])
+
+    return "\n".join(out) + "\n"
+
+
+def export(path: str) -> None:
+    """
+    Export the current metrics to `path`. A .prom file is replaced with
+    Prometheus text (as node_exporter's textfile collector expects); any
+    other file gets the JSON lines appended.
+    """
+    if path.endswith(".prom"):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(to_prometheus())
+    else:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(to_json_lines())
@@ -0,0 +1,259 @@
+"""
+Record / replay transports for the GitHub API session.
+
+RecordingAdapter sends requests over the network and appends every
+request / response pair (headers included) to an archive. ReplayAdapter
+serves the recorded responses back without any network access, with
+optional simulated latency and rate limit headers, so whole runs
+(pagination and conditional requests included) can be repeated offline.
+
+The archive is gzip-compressed JSON lines, one exchange per line. Every
+line is written as its own gzip member, so the file is append-only and
+stays readable even if a recording is interrupted.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+from typing import Iterator, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+# Request headers never written to an archive
+REDACTED_HEADERS = {"authorization", "cookie"}
+
+# Response headers describing the wire encoding; bodies are stored decoded
+WIRE_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+# Request headers making a request conditional
+CONDITIONAL_HEADERS = ("If-None-Match", "If-Modified-Since")
+
+# Length of the simulated rate limit window, in seconds (as on GitHub)
+RATE_LIMIT_WINDOW = 3600
+
+
+class ReplayMiss(requests.RequestException):
+    """
+    Raised by ReplayAdapter for a request that is not in the archive.
+    """
+
+
+def request_key(method: str, url: str, body: Optional[bytes] = None) -> str:
+    """
+    Return the key matching a request to its recordings: the method, the
+    URL with its query parameters sorted, and a hash of the body if any.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    key = f"{method.upper()} {urlunsplit(parts._replace(query=query, fragment=''))}"
+    if body:
+        key += " " + hashlib.sha256(body).hexdigest()[:16]
+    return key
+
+
+def _request_body(request: requests.PreparedRequest) -> Optional[bytes]:
+    body = request.body
+    return body.encode() if isinstance(body, str) else body
+
+
+def _conditions(headers) -> dict:
+    return {name: headers[name] for name in CONDITIONAL_HEADERS if name in headers}
+
+
+def read_archive(path: str) -> Iterator[dict]:
+    """
+    Yield the recorded exchanges of an archive in recording order.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    HTTP adapter that appends every exchange it sends to an archive.
+
+    Credentials (Authorization, Cookie) are never recorded. Thread-safe:
+    one archive can be shared by all the connections of a session.
+    """
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        response = super().send(request, **kwargs)
+        body = _request_body(request)
+        content = response.content
+
+        record = {
+            "key": request_key(request.method, request.url, body),
+            "method": request.method,
+            "url": request.url,
+            "request_headers": {
+                name: value
+                for name, value in request.headers.items()
+                if name.lower() not in REDACTED_HEADERS
+            },
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() not in WIRE_HEADERS
+            },
+            "body_b64": base64.b64encode(content).decode("ascii"),
+            "elapsed": response.elapsed.total_seconds(),
+            "recorded_at": time.time(),
+        }
+        line = (json.dumps(record) + "\n").encode()
+
+        with self._lock, open(self.path, "ab") as f:
+            f.write(gzip.compress(line))
+
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Adapter answering requests from an archive, without any network.
+
+    Requests are matched on method, URL (query order ignored) and body.
+    Repeated requests get the recorded responses in recording order, the
+    last one being repeated. Conditional requests are honoured: a recorded
+    304 is served to the same conditional request, and an If-None-Match
+    matching the ETag of a recorded response gets a 304 even if that
+    exchange was never recorded.
+
+    latency adds a fixed delay (seconds) to every response; with
+    realtime=True the recorded response times are replayed instead. With
+    rate_limit set, X-RateLimit-* headers are rewritten from a simulated
+    budget of that many requests per RATE_LIMIT_WINDOW (304s are free, as
+    on GitHub), answering 403 once it is spent.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        latency: float = 0.0,
+        realtime: bool = False,
+        rate_limit: Optional[int] = None,
+    ):
+        super().__init__()
+        self.path = path
+        self.latency = latency
+        self.realtime = realtime
+        self.rate_limit = rate_limit
+
+        self._exchanges: dict[str, list[dict]] = defaultdict(list)
+        for record in read_archive(path):
+            record["request_headers"] = CaseInsensitiveDict(record["request_headers"])
+            record["headers"] = CaseInsensitiveDict(record["headers"])
+            self._exchanges[record["key"]].append(record)
+
+        self._lock = threading.Lock()
+        self._served: dict[tuple, int] = defaultdict(int)
+        self._used = 0
+        self._window_start = time.time()
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self._exchanges.values())
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        key = request_key(request.method, request.url, _request_body(request))
+        candidates = self._exchanges.get(key)
+        if not candidates:
+            raise ReplayMiss(f"No recorded response for {key}", request=request)
+
+        record, status = self._pick(key, candidates, _conditions(request.headers))
+
+        delay = record["elapsed"] if self.realtime else self.latency
+        if delay > 0:
+            time.sleep(delay)
+
+        headers = record["headers"].copy()
+        body = b"" if status == 304 else base64.b64decode(record["body_b64"])
+        if self.rate_limit is not None:
+            status, body = self._apply_rate_limit(headers, status, body)
+
+        return self._build_response(request, record, status, headers, body)
+
+    def close(self) -> None:
+        pass
+
+    def _pick(self, key: str, candidates: list[dict], conditions: dict) -> tuple[dict, int]:
+        matching = [
+            record for record in candidates if _conditions(record["request_headers"]) == conditions
+        ]
+        if matching:
+            slot = (key, tuple(sorted(conditions.items())))
+            with self._lock:
+                served = self._served[slot]
+                self._served[slot] += 1
+            record = matching[min(served, len(matching) - 1)]
+            return record, record["status"]
+
+        etag = conditions.get("If-None-Match")
+        for record in reversed(candidates):
+            if etag and record["status"] == 200 and record["headers"].get("ETag") == etag:
+                return record, 304
+
+        if conditions:
+            # Unknown validators: answer as to an unconditional request
+            return self._pick(key, candidates, {})
+        return candidates[-1], candidates[-1]["status"]
+
+    def _apply_rate_limit(
+        self, headers: CaseInsensitiveDict, status: int, body: bytes
+    ) -> tuple[int, bytes]:
+        with self._lock:
+            now = time.time()
+            if now - self._window_start >= RATE_LIMIT_WINDOW:
+                self._window_start, self._used = now, 0
+            exhausted = self._used >= self.rate_limit
+            if not exhausted and status != 304:
+                self._used += 1
+            remaining = self.rate_limit - self._used
+            reset = int(self._window_start + RATE_LIMIT_WINDOW)
+
+        headers["X-RateLimit-Limit"] = str(self.rate_limit)
+        headers["X-RateLimit-Remaining"] = str(remaining)
+        headers["X-RateLimit-Used"] = str(self._used)
+        headers["X-RateLimit-Reset"] = str(reset)
+
+        if exhausted:
+            headers["Content-Type"] = "application/json; charset=utf-8"
+            return 403, json.dumps({"message": "API rate limit exceeded (replay)"}).encode()
+        return status, body
+
+    def _build_response(
+        self,
+        request: requests.PreparedRequest,
+        record: dict,
+        status: int,
+        headers: CaseInsensitiveDict,
+        body: bytes,
+    ) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status
+        response.reason = "Not Modified" if status == 304 else record.get("reason")
+        response.headers = headers
+        response.headers["Content-Length"] = str(len(body))
+        response._content = body
+        response.encoding = requests.utils.get_encoding_from_headers(headers) or "utf-8"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = timedelta(seconds=record["elapsed"] if self.realtime else self.latency)
+        return response